@@ -1,4 +1,3 @@
-import os
 from importlib import metadata
 
 import click
@@ -9,8 +8,9 @@ from sebex.cmd.foreach import foreach
 from sebex.cmd.graph import graph
 from sebex.cmd.ls import ls
 from sebex.cmd.release import release
+from sebex.cmd.status import status
 from sebex.cmd.sync import sync
-from sebex.context import Context
+from sebex.context import Context, DEFAULT_HEX_API_URL, DEFAULT_GITHUB_API_URL, default_jobs
 from sebex.log import FatalError, warn
 
 
@@ -22,14 +22,28 @@ from sebex.log import FatalError, warn
               help='Path to the workspace directory.')
 @click.option('-p', '--profile', default='all', required=True, show_default=True, show_envvar=True,
               metavar='NAME', help='Name of the workspace profile to operate in.')
-# Default value same as for ThreadPoolExecutor on Python 3.8
-@click.option('-j', '--jobs', type=click.IntRange(min=1), default=max(32, os.cpu_count() + 4),
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=default_jobs(),
               required=True, show_default=True, show_envvar=True, metavar='COUNT',
-              help='Set number of parallel running jobs.')
+              help='Set number of parallel running jobs, unless limited more specifically.')
+@click.option('--analyze_jobs', type=click.IntRange(min=1), show_envvar=True, metavar='COUNT',
+              help='Number of analyzer processes, defaults to number of cores, '
+                   'as long as they fit in available memory.')
+@click.option('--git_jobs', type=click.IntRange(min=1), show_envvar=True, metavar='COUNT',
+              help='Number of parallel git and other subprocess jobs, defaults to --jobs.')
+@click.option('--net_jobs', type=click.IntRange(min=1), show_envvar=True, metavar='COUNT',
+              help='Number of parallel network requests, defaults to --jobs.')
 @click.option('--github_access_token', required=True, show_envvar=True, metavar='TOKEN',
               help='Github private access token.')
-def cli(**kwargs):
+@click.option('--hex_api_url', default=DEFAULT_HEX_API_URL, required=True, show_default=True,
+              show_envvar=True, metavar='URL',
+              help='Hex API endpoint used to fetch package releases, e.g. a local stand-in.')
+@click.option('--github_api_url', default=DEFAULT_GITHUB_API_URL, required=True,
+              show_default=True, show_envvar=True, metavar='URL',
+              help='GitHub API endpoint, e.g. of GitHub Enterprise or a local stand-in.')
+@click.pass_context
+def cli(ctx, **kwargs):
     Context.initial(**kwargs)
+    ctx.call_on_close(Context.current().close)
 
 
 cli.add_command(bootstrap)
@@ -37,6 +51,7 @@ cli.add_command(foreach)
 cli.add_command(graph)
 cli.add_command(ls)
 cli.add_command(release)
+cli.add_command(status)
 cli.add_command(sync)
 
 
@@ -0,0 +1,52 @@
+from typing import Optional, Iterable, Tuple
+
+from sebex.analysis.model import Language, AnalysisEntry
+from sebex.checksum import Checksum
+from sebex.config.file import ConfigFile
+from sebex.config.format import Format, JsonFormat
+from sebex.config.manifest import ProjectHandle
+
+
+class AnalysisCache(ConfigFile):
+    """
+    Persistent store of analysis results, each entry is keyed by a fingerprint of project
+    sources, as computed by language support. Entries with mismatched fingerprint are stale.
+    """
+
+    _name = 'analysis_cache'
+    _data = {
+        'projects': {}
+    }
+
+    @classmethod
+    def format(cls) -> Format:
+        return JsonFormat()
+
+    def get(self, project: ProjectHandle,
+            fingerprint: Checksum) -> Optional[Tuple[Language, AnalysisEntry]]:
+        raw = self._data['projects'].get(str(project))
+
+        if raw is None or raw['fingerprint'] != str(fingerprint):
+            return None
+
+        return Language(raw['language']), AnalysisEntry.from_raw(raw['entry'])
+
+    def put(self, project: ProjectHandle, fingerprint: Checksum,
+            language: Language, entry: AnalysisEntry):
+        self._data['projects'][str(project)] = {
+            'fingerprint': str(fingerprint),
+            'language': str(language),
+            'entry': entry.to_raw(),
+        }
+
+    def evict(self, keep: Iterable[ProjectHandle]) -> int:
+        """Drop entries of all projects not listed in `keep`, returns number of evicted entries."""
+
+        keep = {str(p) for p in keep}
+        projects = self._data['projects']
+        evicted = [p for p in projects.keys() if p not in keep]
+
+        for p in evicted:
+            del projects[p]
+
+        return len(evicted)
@@ -1,24 +1,27 @@
-from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple, Optional
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Tuple, List, FrozenSet, Optional
 
 import click
 
+from sebex.analysis.cache import AnalysisCache
 from sebex.analysis.model import Language, AnalysisError, AnalysisEntry
-from sebex.config.manifest import ProjectHandle
-from sebex.jobs import for_each
+from sebex.config.manifest import ProjectHandle, Manifest
 from sebex.language import detect_language, language_support_for
-from sebex.log import operation
+from sebex.log import operation, log
 
 _Projects = Dict[ProjectHandle, Tuple[Language, AnalysisEntry]]
 _PackageNameIndex = Dict[str, ProjectHandle]
 
 _UNKNOWN_LANGUAGE = click.style('UNKNOWN LANGUAGE', fg='yellow')
+_CACHED = click.style('cached', fg='cyan')
 
 
 @dataclass(eq=False)
 class AnalysisDatabase:
     _projects: _Projects
     _package_name_index: _PackageNameIndex
+    _changed: FrozenSet[ProjectHandle] = field(default=frozenset(), repr=False)
 
     def projects(self) -> Iterable[ProjectHandle]:
         return self._projects.keys()
@@ -35,46 +38,112 @@ class AnalysisDatabase:
     def get_project_by_package(self, package: str) -> ProjectHandle:
         return self._package_name_index[package]
 
+    def changed_projects(self) -> FrozenSet[ProjectHandle]:
+        """Projects which have been (re)analyzed, instead of being served from analysis cache."""
+        return self._changed
+
     def language(self, project: ProjectHandle) -> Language:
         return self._get_project(project)[0]
 
     def about(self, project: ProjectHandle) -> AnalysisEntry:
         return self._get_project(project)[1]
 
+    def refresh_releases(self):
+        """Fetch current releases of all projects, replacing the ones the database holds."""
+        self._fill_releases(self._projects)
+
     def _get_project(self, project):
         if self.has_project(project):
             return self._projects[project]
         else:
             raise AnalysisError(f'Project not found: "{project}". Make sure projects are synced via `sebex sync`.')
 
+    def to_raw(self) -> Dict:
+        return {
+            'projects': [{'project': str(p), 'language': str(language), 'entry': entry.to_raw()}
+                         for p, (language, entry) in self._projects.items()],
+            'packages': {pkg: str(p) for pkg, p in self._package_name_index.items()},
+        }
+
     @classmethod
-    def collect(cls, projects: Iterable[ProjectHandle]) -> 'AnalysisDatabase':
-        projects = list(projects)
-        projects = zip(projects, for_each(projects, cls._do_collect, desc='Analyzing'))
-        # Filter out ignored
-        projects = filter(lambda t: t[1][1], projects)
-        projects = dict(projects)
-        return cls._analyze(projects)
+    def from_raw(cls, raw: Dict) -> 'AnalysisDatabase':
+        projects = {
+            ProjectHandle.parse(r['project']): (Language(r['language']),
+                                                AnalysisEntry.from_raw(r['entry']))
+            for r in raw['projects']
+        }
+        package_name_index = {pkg: ProjectHandle.parse(p) for pkg, p in raw['packages'].items()}
+        return cls(projects, package_name_index, frozenset())
 
     @classmethod
-    def _analyze(cls, projects: _Projects) -> 'AnalysisDatabase':
-        with operation('Building analysis database'):
-            package_name_index = cls._build_package_name_index(projects)
+    def collect(cls, projects: Iterable[ProjectHandle],
+                use_cache: bool = True) -> 'AnalysisDatabase':
+        projects = list(projects)
+        cache = AnalysisCache.open() if use_cache else None
+
+        with operation('Analyzing', len(projects), 'projects') as reporter:
+            languages = dict(zip(projects, map(detect_language, projects)))
+            result: _Projects = {}
+            pending: Dict[Language, List[ProjectHandle]] = defaultdict(list)
+            fingerprints = {}
+
+            for project, language in languages.items():
+                if language is Language.UNKNOWN:
+                    log(project, _UNKNOWN_LANGUAGE)
+                    continue
+
+                if cache is not None:
+                    fingerprints[project] = language_support_for(language).fingerprint(project)
+                    cached = cache.get(project, fingerprints[project])
+                    if cached is not None and cached[0] == language:
+                        result[project] = cached
+                        continue
 
-        return cls(projects, package_name_index)
+                pending[language].append(project)
+
+            for language, batch in pending.items():
+                entries = language_support_for(language).analyze_many(batch)
+                for project, entry in zip(batch, entries):
+                    result[project] = (language, entry)
+
+                    if cache is not None:
+                        cache.put(project, fingerprints[project], language, entry)
+
+            analyzed = sum(len(b) for b in pending.values())
+            if cache is not None:
+                reporter(f'{analyzed} analyzed, {len(result) - analyzed} {_CACHED}')
+
+        cls._fill_releases(result)
+
+        if cache is not None:
+            with operation('Saving analysis cache'):
+                cache.evict(p for r in Manifest.current().iter_repositories()
+                            for p in r.project_handles())
+                cache.save()
+
+        # Preserve order in which projects have been passed
+        return cls._analyze({p: result[p] for p in projects if p in result},
+                            changed=(p for b in pending.values() for p in b))
 
     @staticmethod
-    def _do_collect(project: ProjectHandle) -> Tuple[Language, Optional[AnalysisEntry]]:
-        with operation('Analyzing', project) as reporter:
-            language = detect_language(project)
+    def _fill_releases(projects: _Projects):
+        by_language: Dict[Language, List[AnalysisEntry]] = defaultdict(list)
+        for language, entry in projects.values():
+            by_language[language].append(entry)
+
+        for language, entries in by_language.items():
+            releases = language_support_for(language).fetch_releases([e.package for e in entries])
+            for entry in entries:
+                entry.releases = releases.get(entry.package, [])
 
-            if language is Language.UNKNOWN:
-                reporter(_UNKNOWN_LANGUAGE)
-                return language, None
+    @classmethod
+    def _analyze(cls, projects: _Projects,
+                 changed: Optional[Iterable[ProjectHandle]] = None) -> 'AnalysisDatabase':
+        with operation('Building analysis database'):
+            package_name_index = cls._build_package_name_index(projects)
 
-            support = language_support_for(language)
-            entry = support.analyze(project)
-            return language, entry
+        changed = frozenset(projects.keys() if changed is None else changed)
+        return cls(projects, package_name_index, changed)
 
     @classmethod
     def _build_package_name_index(cls, projects: _Projects) -> _PackageNameIndex:
@@ -1,6 +1,7 @@
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set
+from collections import deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Optional, Set, Mapping, FrozenSet, Tuple, Iterable
 
 from graphviz import Digraph
 
@@ -15,40 +16,90 @@ _Graph = Dict[str, _Edges]
 
 @dataclass(frozen=True)
 class DependentsGraph:
+    """
+    Graph of managed packages, with edges pointing from dependencies to their dependents.
+
+    Both reverse (dependency to dependents) and forward (dependent to dependencies) adjacency
+    is indexed once on construction, and exposed as immutable mappings.
+    """
+
     _graph: _Graph
+    _dependents: Mapping[str, Mapping[str, FrozenSet[Dependency]]] = \
+        field(init=False, repr=False, compare=False)
+    _dependencies: Mapping[str, Tuple[str, ...]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        graph = MappingProxyType({pkg: MappingProxyType(dict(edges))
+                                  for pkg, edges in self._graph.items()})
+
+        dependents = MappingProxyType({
+            pkg: MappingProxyType({dependent: frozenset([dep])
+                                   for dependent, dep in edges.items()})
+            for pkg, edges in graph.items()
+        })
+
+        dependencies = {pkg: [] for pkg in graph.keys()}
+        for pkg, edges in graph.items():
+            for dependent in edges.keys():
+                dependencies[dependent].append(pkg)
+
+        object.__setattr__(self, '_graph', graph)
+        object.__setattr__(self, '_dependents', dependents)
+        object.__setattr__(self, '_dependencies', MappingProxyType(
+            {pkg: tuple(sorted(deps)) for pkg, deps in dependencies.items()}))
 
     def __len__(self):
         return len(self._graph)
 
-    def dependents_of(self, package: str) -> Dict[str, Set[Dependency]]:
-        result = defaultdict(set)
+    def dependents_of(self, package: str) -> Mapping[str, FrozenSet[Dependency]]:
+        return self._dependents[package]
 
-        for dep in self._graph[package].values():
-            result[dep.defined_in].add(dep)
+    def dependencies_of(self, package: str) -> Tuple[str, ...]:
+        """List managed packages `package` directly depends on."""
+        return self._dependencies[package]
 
-        return dict(result)
+    def relations_of(self, package: str) -> Mapping[str, Dependency]:
+        """Map each direct dependent of `package` to the relation connecting them."""
+        return self._graph[package]
+
+    def relation(self, dependency: str, dependent: str) -> Dependency:
+        return self._graph[dependency][dependent]
 
     def upgrade_phases(self, package: str) -> List[Set[str]]:
         """
         Collect all dependents of `package`, sorted topologically,
         with dependencies which are independent of each other grouped together into `phases`.
-        """
-
-        depths = defaultdict(lambda: 0)
 
-        def visit(pkg: str, depth: int):
-            depths[pkg] = max(depths[pkg], depth)
+        Each dependent is placed in the phase equal to the length of the longest dependency path
+        leading to it from `package`, computed by layering over Kahn's topological order.
+        """
 
+        # Find the subgraph reachable from the package and count in-degrees within it
+        in_degrees = {package: 0}
+        queue = deque([package])
+        while queue:
+            pkg = queue.popleft()
             for dep in self._graph[pkg].keys():
-                visit(dep, depth + 1)
+                if dep not in in_degrees:
+                    in_degrees[dep] = 0
+                    queue.append(dep)
+                in_degrees[dep] += 1
 
-        visit(package, 0)
+        depths = {package: 0}
+        queue = deque([package])
+        while queue:
+            pkg = queue.popleft()
+            for dep in self._graph[pkg].keys():
+                depths[dep] = max(depths.get(dep, 0), depths[pkg] + 1)
+                in_degrees[dep] -= 1
+                if in_degrees[dep] == 0:
+                    queue.append(dep)
 
-        inversion = defaultdict(set)
-        for pkg, depth in sorted(depths.items(), key=lambda t: t[1]):
-            inversion[depth].add(pkg)
+        phases = [set() for _ in range(max(depths.values()) + 1)]
+        for pkg, depth in depths.items():
+            phases[depth].add(pkg)
 
-        return list(inversion.values())
+        return phases
 
     def graphviz(self, db: AnalysisDatabase) -> Digraph:
         dot = Digraph()
@@ -69,6 +120,51 @@ class DependentsGraph:
         with operation('Building dependency graph'):
             return cls(cls._invert(cls._guard_cycle(cls._build_graph(db))))
 
+    def to_raw(self) -> Dict:
+        return {pkg: {dependent: dep.to_raw() for dependent, dep in edges.items()}
+                for pkg, edges in self._graph.items()}
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> 'DependentsGraph':
+        return cls({pkg: {dependent: Dependency.from_raw(dep) for dependent, dep in edges.items()}
+                    for pkg, edges in raw.items()})
+
+    def patch(self, db: AnalysisDatabase,
+              changed: Optional[Iterable[ProjectHandle]] = None) -> 'DependentsGraph':
+        """
+        Build graph for `db`, which is a newer version of the database this graph has been
+        built from. Only dependencies of `changed` projects (by default, the ones re-analyzed
+        by `db`) are collected again, and the cycle check is skipped if no edge has changed.
+
+        Falls back to full rebuild if the set of managed packages is different.
+        """
+
+        if set(db.managed_packages()) != set(self._graph.keys()):
+            return self.build(db)
+
+        with operation('Patching dependency graph'):
+            if changed is None:
+                changed = db.changed_projects()
+
+            changed = {db.about(p).package: p for p in changed if db.has_project(p)}
+            graph = {}
+            dirty = False
+
+            for pkg in self._graph.keys():
+                edges = {dep: self.relation(dep, pkg) for dep in self.dependencies_of(pkg)}
+
+                if pkg in changed:
+                    new_edges = self._collect_edges(changed[pkg], db)
+                    dirty = dirty or new_edges != edges
+                    edges = new_edges
+
+                graph[pkg] = edges
+
+            if not dirty:
+                return self
+
+            return DependentsGraph(self._invert(self._guard_cycle(graph)))
+
     @classmethod
     def _build_graph(cls, db):
         return {
@@ -96,29 +192,98 @@ class DependentsGraph:
 
     @classmethod
     def _guard_cycle(cls, graph: _Graph) -> _Graph:
-        cycle = cls._detect_cycle(graph)
-        if cycle is None:
+        cycles = cls._detect_cycles(graph)
+        if not cycles:
             return graph
+        elif len(cycles) == 1:
+            raise ValueError(f'Cycle in dependency graph detected: {"->".join(cycles[0])}')
         else:
-            raise ValueError(f'Cycle in dependency graph detected: {"->".join(cycle)}')
+            raise ValueError(f'{len(cycles)} cycles in dependency graph detected: '
+                             f'{", ".join("->".join(c) for c in cycles)}')
 
     @classmethod
-    def _detect_cycle(cls, graph: _Graph) -> Optional[List[str]]:
-        def visit(pkg: str, stack: List[str]) -> Optional[List[str]]:
-            for dep in graph[pkg].keys():
-                new_stack = [*stack, dep]
-                if dep in stack:
-                    return new_stack
+    def _detect_cycles(cls, graph: _Graph) -> List[List[str]]:
+        """Find an example cycle for each cyclic strongly connected component of the graph."""
+
+        return sorted(
+            cls._example_cycle(graph, component)
+            for component in cls._strongly_connected_components(graph)
+            if len(component) > 1 or component[0] in graph[component[0]]
+        )
+
+    @staticmethod
+    def _strongly_connected_components(graph: _Graph) -> List[List[str]]:
+        """Tarjan's algorithm, implemented iteratively to not hit recursion limit."""
+
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components: List[List[str]] = []
+
+        def push(pkg: str):
+            index[pkg] = lowlink[pkg] = len(index)
+            stack.append(pkg)
+            on_stack.add(pkg)
+
+        for root in graph.keys():
+            if root in index:
+                continue
+
+            push(root)
+            work = [(root, iter(graph[root].keys()))]
+
+            while work:
+                pkg, deps = work[-1]
+
+                for dep in deps:
+                    if dep not in index:
+                        push(dep)
+                        work.append((dep, iter(graph[dep].keys())))
+                        break
+                    elif dep in on_stack:
+                        lowlink[pkg] = min(lowlink[pkg], index[dep])
                 else:
-                    res = visit(dep, new_stack)
-                    if res is not None:
-                        return res
+                    work.pop()
+
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[pkg])
+
+                    if lowlink[pkg] == index[pkg]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.remove(member)
+                            component.append(member)
+                            if member == pkg:
+                                break
+                        components.append(component)
 
-            return None
+        return components
 
-        for package in graph.keys():
-            result = visit(package, [package])
-            if result is not None:
-                return result
+    @staticmethod
+    def _example_cycle(graph: _Graph, component: List[str]) -> List[str]:
+        """
+        Find the shortest cycle within a strongly connected component, which passes through
+        the alphabetically first member of the component.
+        """
+
+        members = set(component)
+        start = min(component)
+        parents: Dict[str, Optional[str]] = {start: None}
+        queue = deque([start])
+
+        while queue:
+            pkg = queue.popleft()
+            for dep in graph[pkg].keys():
+                if dep == start:
+                    path = [pkg]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return [*reversed(path), start]
+                elif dep in members and dep not in parents:
+                    parents[dep] = pkg
+                    queue.append(dep)
 
-        return None
+        assert False, 'unreachable'
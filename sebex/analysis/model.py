@@ -28,6 +28,23 @@ class Dependency:
     def version_str(self):
         return str(self.version_spec.value)
 
+    def to_raw(self) -> Dict:
+        return {
+            'name': self.name,
+            'defined_in': self.defined_in,
+            'version_spec': self.version_spec.to_raw(),
+            'version_spec_span': self.version_spec_span.to_raw(),
+        }
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> 'Dependency':
+        return cls(
+            name=raw['name'],
+            defined_in=raw['defined_in'],
+            version_spec=VersionSpec.from_raw(raw['version_spec']),
+            version_spec_span=Span.from_raw(raw['version_spec_span']),
+        )
+
     def prepare_update(self, to_spec: VersionSpec) -> 'DependencyUpdate':
         return DependencyUpdate(
             name=self.name,
@@ -42,6 +59,13 @@ class Release:
     version: Version
     retired: bool = False
 
+    def to_raw(self) -> Dict:
+        return {'version': str(self.version), 'retired': self.retired}
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> 'Release':
+        return cls(version=Version.parse(raw['version']), retired=raw.get('retired', False))
+
 
 @dataclass
 class AnalysisEntry:
@@ -55,6 +79,25 @@ class AnalysisEntry:
     def is_published(self) -> bool:
         return bool(self.releases)
 
+    def to_raw(self) -> Dict:
+        return {
+            'package': self.package,
+            'version': str(self.version),
+            'version_span': self.version_span.to_raw(),
+            'dependencies': [d.to_raw() for d in self.dependencies],
+            'releases': [r.to_raw() for r in self.releases],
+        }
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> 'AnalysisEntry':
+        return cls(
+            package=raw['package'],
+            version=Version.parse(raw['version']),
+            version_span=Span.from_raw(raw['version_span']),
+            dependencies=[Dependency.from_raw(d) for d in raw.get('dependencies', [])],
+            releases=[Release.from_raw(r) for r in raw.get('releases', [])],
+        )
+
 
 @dataclass
 class DependencyUpdate:
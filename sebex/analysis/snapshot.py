@@ -0,0 +1,105 @@
+import json
+from typing import Dict, Iterable, List, Optional, Tuple, TextIO
+
+from sebex.analysis.database import AnalysisDatabase
+from sebex.analysis.graph import DependentsGraph
+from sebex.analysis.model import Language
+from sebex.config.file import ConfigFile
+from sebex.config.format import Format, JsonFormat
+from sebex.config.manifest import ProjectHandle
+from sebex.language import detect_language, language_support_for
+
+SNAPSHOT_VERSION = 2
+
+
+class SnapshotFormat(JsonFormat):
+    def ext(self) -> str:
+        return '.snapshot'
+
+    def dump(self, data, fp: TextIO):
+        json.dump(data, fp, separators=(',', ':'))
+
+
+class AnalysisSnapshot(ConfigFile):
+    """
+    Serialized result of the last full analysis: the analysis database together with
+    the dependency graph built from it.
+
+    Each project is stored along with the fingerprint of its sources, the snapshot is
+    considered fresh if the set of analyzed projects and all of their fingerprints match.
+
+    Releases of projects are not stored, because they change independently of the sources.
+    Restored database has to have them refreshed via `AnalysisDatabase.refresh_releases`.
+    """
+
+    _name = 'analysis'
+    _data = {
+        'version': SNAPSHOT_VERSION,
+        'fingerprints': {},
+        'database': None,
+        'graph': None,
+    }
+
+    @classmethod
+    def format(cls) -> Format:
+        return SnapshotFormat()
+
+    @property
+    def is_empty(self) -> bool:
+        return self._data['version'] != SNAPSHOT_VERSION or self._data['database'] is None
+
+    def store(self, database: AnalysisDatabase, graph: DependentsGraph,
+              fingerprints: Dict[ProjectHandle, str]):
+        self._data = {
+            'version': SNAPSHOT_VERSION,
+            'fingerprints': {str(p): f for p, f in fingerprints.items()},
+            'database': _without_releases(database.to_raw()),
+            'graph': graph.to_raw(),
+        }
+
+    def restore(self) -> Optional[Tuple[AnalysisDatabase, DependentsGraph]]:
+        if self.is_empty:
+            return None
+
+        return (AnalysisDatabase.from_raw(self._data['database']),
+                DependentsGraph.from_raw(self._data['graph']))
+
+    def restore_graph(self) -> Optional[DependentsGraph]:
+        return DependentsGraph.from_raw(self._data['graph']) if not self.is_empty else None
+
+    def stale_projects(self, fingerprints: Dict[ProjectHandle, str]) -> List[ProjectHandle]:
+        """List projects which are missing in the snapshot or have their sources changed."""
+
+        if self.is_empty:
+            return list(fingerprints.keys())
+
+        stored = self._data['fingerprints']
+        return [p for p, f in fingerprints.items() if stored.get(str(p)) != f]
+
+    def is_fresh(self, fingerprints: Dict[ProjectHandle, str]) -> bool:
+        return (not self.is_empty
+                and len(fingerprints) == len(self._data['fingerprints'])
+                and not self.stale_projects(fingerprints))
+
+
+def _without_releases(raw: Dict) -> Dict:
+    for project in raw['projects']:
+        project['entry'].pop('releases', None)
+    return raw
+
+
+def fingerprint_projects(projects: Iterable[ProjectHandle]) -> Dict[ProjectHandle, str]:
+    """
+    Compute freshness keys of given projects. Language is included, so that projects switching
+    language are detected too. Projects of unknown language are omitted.
+    """
+
+    result = {}
+
+    for project in projects:
+        language = detect_language(project)
+        if language is not Language.UNKNOWN:
+            fingerprint = language_support_for(language).fingerprint(project)
+            result[project] = f'{language}:{fingerprint}'
+
+    return result
@@ -2,10 +2,39 @@ from typing import Tuple
 
 from sebex.analysis.database import AnalysisDatabase
 from sebex.analysis.graph import DependentsGraph
+from sebex.analysis.snapshot import AnalysisSnapshot, fingerprint_projects
 from sebex.config.profile import current_project_handles
+from sebex.log import operation
 
 
-def analyze() -> Tuple[AnalysisDatabase, DependentsGraph]:
-    database = AnalysisDatabase.collect(current_project_handles())
-    graph = DependentsGraph.build(database)
+def analyze(refresh: bool = False) -> Tuple[AnalysisDatabase, DependentsGraph]:
+    """
+    Analyze current projects. If nothing has changed since the last analysis, its snapshot is
+    loaded instead. Pass `refresh` to ignore both the snapshot and the analysis cache.
+    """
+
+    projects = list(current_project_handles())
+    fingerprints = fingerprint_projects(projects)
+    snapshot = AnalysisSnapshot.open()
+
+    if not refresh and snapshot.is_fresh(fingerprints):
+        with operation('Loading analysis snapshot'):
+            database, graph = snapshot.restore()
+
+        # Releases are not part of the snapshot, they can change without touching the sources
+        database.refresh_releases()
+        return database, graph
+
+    database = AnalysisDatabase.collect(projects, use_cache=not refresh)
+
+    previous = None if refresh else snapshot.restore_graph()
+    if previous is not None:
+        graph = previous.patch(database, snapshot.stale_projects(fingerprints))
+    else:
+        graph = DependentsGraph.build(database)
+
+    with operation('Saving analysis snapshot'):
+        snapshot.store(database, graph, fingerprints)
+        snapshot.save()
+
     return database, graph
@@ -1,5 +1,6 @@
 import hashlib
 from abc import ABC, abstractmethod
+from pathlib import Path
 from random import Random
 from typing import Callable, Any
 
@@ -60,6 +61,18 @@ class Checksum:
 
         return cls(m.hexdigest())
 
+    @classmethod
+    def of_git_blob(cls, path: Path) -> 'Checksum':
+        """
+        Compute the object ID Git assigns to the contents of a file, without spawning Git.
+
+        >>> Checksum.of_git_blob(Path('/dev/null'))
+        Checksum(e69de29bb2d1d6434b8b29ae775ad8c2e48c5391)
+        """
+
+        data = path.read_bytes()
+        return cls(hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest())
+
 
 class Checksumable(ABC):
     @abstractmethod
@@ -1,3 +1,5 @@
+from threading import Lock
+
 import click
 
 from sebex.analysis.version import Version
@@ -14,14 +16,11 @@ class ProjectType(click.ParamType):
         except ValueError:
             self.fail(f'{value!r} is not a valid project name', param, ctx)
 
-        manifest = Manifest.open()
-
-        for repo_manifest in manifest.iter_repositories():
-            for project in repo_manifest.project_handles():
-                if project == handle:
-                    return project
+        project = Manifest.current().find_project(handle)
+        if project is None:
+            self.fail(f'Unknown project {handle}')
 
-        self.fail(f'Unknown project {handle}')
+        return project
 
 
 PROJECT = ProjectType()
@@ -40,9 +39,14 @@ class VersionType(click.ParamType):
 VERSION = VersionType()
 
 
+_confirm_lock = Lock()
+
+
 def confirm(text: str) -> bool:
     ctx = Context.current()
     if ctx.assume_yes:
         return True
     else:
-        return click.confirm(text)
+        # Prompts may be issued from parallel jobs, ask one question at a time
+        with _confirm_lock:
+            return click.confirm(text)
@@ -3,16 +3,20 @@ from typing import Optional
 
 import click
 
+from sebex.config.bootstrap import BootstrapState
 from sebex.config.manifest import Manifest, RepositoryManifest
 from sebex.context import Context
-from sebex.log import warn
+from sebex.log import warn, operation
 from sebex.name_similarity import find_similar_name_clashes, REPO_NAME_SIMILARITY
 
 
 @click.command()
 @click.option('-o', '--organization',
               help='Name of Github organization to import repositories from.')
-def bootstrap(organization: Optional[str]):
+@click.option('--full', is_flag=True,
+              help='Import all repositories, including ones which have not changed '
+                   'since the last bootstrap.')
+def bootstrap(organization: Optional[str], full: bool):
     """
     Set up workspace directories and/or load add all repositories from specified Github
     organization.
@@ -21,10 +25,7 @@ def bootstrap(organization: Optional[str]):
     Path(Context.current().meta_path).mkdir(parents=True, exist_ok=True)
     with Manifest.open().transaction() as manifest:
         if organization:
-            org = Context.current().github.get_organization(organization)
-            for gh_repo in sorted(org.get_repos(type='public'), key=lambda r: r.full_name):
-                repo = RepositoryManifest.from_github_repository(gh_repo)
-                manifest.upsert_repository(repo)
+            _import_organization(manifest, organization, full)
 
         manifest.sort_repositories()
 
@@ -36,3 +37,28 @@ def bootstrap(organization: Optional[str]):
             warn("Consider checking manifest file and merging these:")
             for a, b, sim in clashes:
                 warn("-", a, "and", b, f"({str(sim)})")
+
+
+def _import_organization(manifest: Manifest, organization: str, full: bool):
+    state = BootstrapState.open()
+
+    with operation('Importing repositories of', organization) as reporter:
+        raw_repos, _ = Context.current().github_api.get_all(
+            f'orgs/{organization}/repos?type=public&per_page=100')
+
+        keys = {}
+        imported = 0
+        for raw in sorted(raw_repos, key=lambda r: r['full_name']):
+            key = keys[raw['name']] = BootstrapState.freshness_key(raw)
+
+            if not full and state.get(organization, raw['name']) == key \
+                    and manifest.find_repository_by_name(raw['name']) is not None:
+                continue
+
+            manifest.upsert_repository(RepositoryManifest.from_github_raw(raw))
+            imported += 1
+
+        reporter(f'{imported} imported, {len(raw_repos) - imported} unchanged')
+
+    state.replace(organization, keys)
+    state.save()
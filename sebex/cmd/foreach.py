@@ -1,27 +1,60 @@
 import re
-from typing import Optional
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, List, Tuple
 
 import click
 
 from sebex.checksum import Checksum
+from sebex.config.manifest import RepositoryHandle
 from sebex.config.profile import current_repository_handles
-from sebex.log import logcontext, log, error
+from sebex.jobs import for_each, JobKind
+from sebex.log import logcontext, log, error, buffered
 from sebex.popen import popen
 
 
+class Result(Enum):
+    CHANGED = 'changed'
+    UNCHANGED = 'unchanged'
+    SKIPPED = 'skipped'
+    FAILED = 'failed'
+
+    @property
+    def color(self) -> str:
+        return {
+            Result.CHANGED: 'green',
+            Result.UNCHANGED: 'cyan',
+            Result.SKIPPED: 'yellow',
+            Result.FAILED: 'red',
+        }[self]
+
+
+@dataclass
+class Outcome:
+    repo: RepositoryHandle
+    result: Result
+    duration: float
+    details: str = ''
+
+
 @click.command()
 @click.argument('command')
 @click.option('--pr/--no-pr', ' /-P', default=True, help='No not try to open pull request.')
 @click.option('-t', '--title',
               help='Pull request title, if not specified a codename will be generated.')
 @click.option('-b', '--body', default='', show_default=True, help='Pull request body.')
-def foreach(command: str, pr: bool, title: Optional[str], body: str):
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=1, show_default=True,
+              metavar='COUNT', help='Number of repositories to process concurrently.')
+def foreach(command: str, pr: bool, title: Optional[str], body: str, jobs: int):
     """
     Execute a shell command for each repository in current profile and open pull request
     with changes if any.
 
     Clean state of repository is checked before executing the script. If repository is
-    dirty, then operation is aborted. It is recommended to make scripts idempotent.
+    dirty, then it is skipped. Failures do not stop processing other repositories, instead
+    all outcomes are summarized at the end. It is recommended to make scripts idempotent.
     """
 
     title: str = title if title else Checksum.of(command).petname
@@ -32,21 +65,64 @@ def foreach(command: str, pr: bool, title: Optional[str], body: str):
     branch = branch[:16]
     branch = branch.strip('-')
 
-    for repo in current_repository_handles():
-        with logcontext(str(repo)):
-            if repo.vcs.is_dirty():
-                error('Repository is not in clean state! Ignoring.')
-                continue
+    def run(repo: RepositoryHandle) -> Outcome:
+        start = time.monotonic()
+
+        # When running concurrently, output of each repository is printed at once, when it is done
+        with buffered() if jobs > 1 else nullcontext(), logcontext(str(repo)):
+            try:
+                result, details = _run_in_repository(repo, command, pr, title, body, branch)
+            except Exception as e:
+                error('Failed:', e)
+                message = str(e).strip()
+                result, details = Result.FAILED, message.splitlines()[0] if message else ''
+
+        return Outcome(repo, result, time.monotonic() - start, details)
+
+    outcomes = for_each(current_repository_handles(), run, desc='Executing', jobs=jobs,
+                        kind=JobKind.GIT)
+
+    log()
+    _print_summary(outcomes)
+
+
+def _run_in_repository(repo: RepositoryHandle, command: str, pr: bool, title: str, body: str,
+                       branch: str) -> Tuple[Result, str]:
+    if repo.vcs.is_dirty():
+        error('Repository is not in clean state! Ignoring.')
+        return Result.SKIPPED, 'dirty working tree'
+
+    base = repo.vcs.active_branch
+
+    popen(command, log_stdout=True, shell=True, cwd=repo.location)
+
+    if not repo.vcs.is_dirty():
+        log('No changes were made.')
+        return Result.UNCHANGED, ''
+
+    if not pr:
+        return Result.CHANGED, ''
+
+    repo.vcs.checkout(branch, ensure_clean=False)
+    repo.vcs.commit(title)
+    repo.vcs.open_pull_request(title=title, body=body, branch=branch, base=base)
+    repo.vcs.checkout(base)
+    return Result.CHANGED, f'branch {branch}'
+
 
-            base = repo.vcs.active_branch
+def _print_summary(outcomes: List[Outcome]):
+    rows = [(str(o.repo), o.result, f'{o.duration:.1f}s', o.details) for o in outcomes]
+    name_width = max([len('REPOSITORY')] + [len(r[0]) for r in rows])
+    result_width = max(len(r.value) for r in Result)
+    time_width = max([len('TIME')] + [len(r[2]) for r in rows])
 
-            popen(command, log_stdout=True, shell=True, cwd=repo.location)
+    log(click.style(f'{"REPOSITORY":<{name_width}}  {"RESULT":<{result_width}}  '
+                    f'{"TIME":>{time_width}}  DETAILS', bold=True))
+    for name, result, duration, details in rows:
+        log(f'{name:<{name_width}}  '
+            f'{click.style(f"{result.value:<{result_width}}", fg=result.color)}  '
+            f'{duration:>{time_width}}  {details}'.rstrip())
 
-            if pr:
-                if not repo.vcs.is_dirty():
-                    log('No changes were made.')
-                else:
-                    repo.vcs.checkout(branch, ensure_clean=False)
-                    repo.vcs.commit(title)
-                    repo.vcs.open_pull_request(title=title, body=body, branch=branch, base=base)
-                    repo.vcs.checkout(base)
+    counts = ', '.join(f'{sum(1 for o in outcomes if o.result == r)} {r.value}' for r in Result)
+    log()
+    log(f'{len(outcomes)} repositories: {counts}')
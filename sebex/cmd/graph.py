@@ -5,10 +5,12 @@ from sebex.analysis.state import analyze
 
 @click.command()
 @click.option('--view', is_flag=True, help='Preview the graph using GraphViz.')
-def graph(view):
+@click.option('--refresh', is_flag=True,
+              help='Analyze all projects from scratch, ignoring cached analysis results.')
+def graph(view, refresh):
     """Collect and analyze repository dependency graph."""
 
-    database, dep_graph = analyze()
+    database, dep_graph = analyze(refresh=refresh)
     dot = dep_graph.graphviz(database)
     if view:
         dot.view(cleanup=True)
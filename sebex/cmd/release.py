@@ -36,7 +36,9 @@ def status():
 @click.option('--version', type=VERSION, required=True, prompt=True)
 @click.option('--dry', is_flag=True,
               help='Print what would be done, but do not persist the generated plan.')
-def plan(project: ProjectHandle, version: Version, dry: bool):
+@click.option('--refresh', is_flag=True,
+              help='Analyze all projects from scratch, ignoring cached analysis results.')
+def plan(project: ProjectHandle, version: Version, dry: bool, refresh: bool):
     """
     Prepare release plan for managed package.
     """
@@ -47,7 +49,7 @@ def plan(project: ProjectHandle, version: Version, dry: bool):
             fatal(f'Release "{rel.codename()}" is already running.',
                   'Please finish it before creating new one.')
 
-    database, graph = analyze()
+    database, graph = analyze(refresh=refresh)
     rel = ReleaseState.plan(project, version, database, graph)
 
     log()
@@ -62,7 +64,15 @@ def plan(project: ProjectHandle, version: Version, dry: bool):
 @release.command()
 @click.option('--dry', is_flag=True,
               help='Print what would be done, but do not perform any changes.')
-def proceed(dry: bool):
+@click.option('--parallel', is_flag=True,
+              help='Proceed with projects of current phase concurrently.')
+@click.option('--pipeline', is_flag=True,
+              help='Proceed with each project as soon as its dependencies are published, '
+                   'without waiting for whole phases to finish. Implies concurrency.')
+@click.option('--watch', is_flag=True,
+              help='Instead of stopping at pull requests awaiting merge, watch them and merge '
+                   'each one as soon as it is ready.')
+def proceed(dry: bool, parallel: bool, pipeline: bool, watch: bool):
     """
     Execute saved release plan until next breakpoint or new phase.
     """
@@ -72,12 +82,12 @@ def proceed(dry: bool):
 
     rel = ReleaseState.open()
     if dry:
-        for task in execute_plan(rel):
+        for task in execute_plan(rel, pipeline=pipeline):
             log(f'{task.project.project}: {task.human_name}')
     else:
         with operation('Proceeding release'):
             with rel.transaction():
-                action = proceed_plan(rel)
+                action = proceed_plan(rel, parallel=parallel, pipeline=pipeline, watch=watch)
 
         if action == Action.FINISH:
             if rel.is_done():
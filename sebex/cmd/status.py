@@ -0,0 +1,83 @@
+from typing import Optional, Tuple, List, Union
+
+import click
+from git import GitCommandError
+
+from sebex.config.manifest import RepositoryManifest
+from sebex.config.profile import current_repositories
+from sebex.jobs import for_each, JobKind
+from sebex.log import log
+from sebex.vcs import RepositoryStatus
+
+
+@click.command()
+@click.option('-d', '--dirty', is_flag=True,
+              help='Only list repositories which are dirty, diverged or on non-default branch.')
+def status(dirty: bool):
+    """Show branch and working tree status of all repositories in current profile."""
+
+    def collect(manifest: RepositoryManifest) -> Union[RepositoryStatus, str]:
+        if not manifest.handle.exists():
+            return 'not cloned'
+
+        try:
+            return manifest.handle.vcs.status()
+        except GitCommandError as e:
+            return e.stderr.strip().splitlines()[-1] if e.stderr.strip() else str(e)
+
+    repos = list(current_repositories())
+    statuses = for_each(repos, collect, desc='Checking status', item_desc=lambda r: r.handle,
+                        kind=JobKind.GIT)
+
+    rows = [_row(m, s) for m, s in zip(repos, statuses)
+            if not dirty or _needs_attention(m, s)]
+
+    _print_table(rows)
+
+
+def _needs_attention(manifest: RepositoryManifest, st: Union[RepositoryStatus, str]) -> bool:
+    return (not isinstance(st, RepositoryStatus)
+            or st.branch != manifest.default_branch
+            or st.ahead or st.behind or st.is_dirty)
+
+
+# Cells are pairs of text and color
+_Row = List[Tuple[str, Optional[str]]]
+
+
+def _row(manifest: RepositoryManifest, st: Union[RepositoryStatus, str]) -> _Row:
+    if not isinstance(st, RepositoryStatus):
+        return [(manifest.name, None), ('', None), ('', None), (st, 'red')]
+
+    if st.branch is None:
+        branch = ('(detached)', 'yellow')
+    else:
+        branch = (st.branch, None if st.branch == manifest.default_branch else 'yellow')
+
+    if st.upstream is None:
+        sync = ('no upstream', 'bright_black')
+    elif st.ahead or st.behind:
+        sync = (' '.join(p for p in (f'+{st.ahead}' if st.ahead else '',
+                                     f'-{st.behind}' if st.behind else '') if p), 'magenta')
+    else:
+        sync = ('up to date', None)
+
+    changes = [f'{count} {what}' for count, what in ((st.conflicts, 'conflicted'),
+                                                     (st.changed, 'changed'),
+                                                     (st.untracked, 'untracked')) if count]
+    if changes:
+        work_tree = (', '.join(changes), 'red' if st.conflicts else 'yellow')
+    else:
+        work_tree = ('clean', 'green')
+
+    return [(manifest.name, None), branch, sync, work_tree]
+
+
+def _print_table(rows: List[_Row]):
+    header = ['REPOSITORY', 'BRANCH', 'UPSTREAM', 'CHANGES']
+    widths = [max([len(h)] + [len(r[i][0]) for r in rows]) for i, h in enumerate(header)]
+
+    log(click.style('  '.join(h.ljust(w) for h, w in zip(header, widths)).rstrip(), bold=True))
+    for row in rows:
+        log('  '.join(click.style(text.ljust(w), fg=color)
+                      for (text, color), w in zip(row, widths)).rstrip())
@@ -1,32 +1,63 @@
+from typing import Optional
+
 import click
 from git import Repo
 
+from sebex.config.clone import CloneSettings
 from sebex.config.manifest import RepositoryManifest
 from sebex.config.profile import current_repositories
-from sebex.jobs import for_each
+from sebex.jobs import for_each, JobKind
 from sebex.log import error, success, operation
 
 
 @click.command()
 @click.option('--clone/--no-clone', default=True, help='Attempt to clone new repositories.')
 @click.option('--fetch/--pull', default=False, help='Run fetch only, do not pull any changes.')
-def sync(clone, fetch):
+@click.option('--depth', type=click.IntRange(min=0), metavar='N',
+              help='Create shallow clones with history truncated to N commits, '
+                   '0 fetches full history of existing ones. Remembered for the workspace.')
+@click.option('--filter', 'filter_spec', metavar='SPEC',
+              help='Create partial clones, e.g. blob:none to download file contents on demand, '
+                   'none to disable. Remembered for the workspace.')
+@click.option('--all', 'all_remotes', is_flag=True,
+              help='Fetch all remotes and submodules, in parallel (see --git_jobs).')
+def sync(clone, fetch, depth: Optional[int], filter_spec: Optional[str], all_remotes: bool):
     """Sync repositories in current profile."""
 
+    settings = CloneSettings.open()
+    if depth is not None or filter_spec is not None:
+        with settings.transaction():
+            if depth is not None:
+                settings.depth = depth
+            if filter_spec is not None:
+                settings.filter = filter_spec
+
     def do_sync(manifest: RepositoryManifest):
         repo = manifest.handle
         if not repo.exists():
             if clone:
-                with operation('Cloning', repo):
-                    Repo.clone_from(manifest.remote_url, manifest.location)
+                clone_repository(manifest, settings)
             else:
                 error('Repository is not cloned:', repo)
         else:
-            if fetch:
-                repo.vcs.fetch()
-            else:
+            # Full history is fetched only on explicit request, other shallow clones stay so
+            if depth == 0 and repo.vcs.is_shallow:
+                repo.vcs.unshallow()
+
+            repo.vcs.fetch(all_remotes=all_remotes)
+            if not fetch:
                 repo.vcs.pull()
 
     repos = list(current_repositories())
-    for_each(repos, do_sync, desc='Syncing', item_desc=lambda r: r.handle)
+    for_each(repos, do_sync, desc='Syncing', item_desc=lambda r: r.handle, kind=JobKind.GIT,
+             keep_going=True)
     success('Successfully synced', len(repos), 'repositories.')
+
+
+def clone_repository(manifest: RepositoryManifest, settings: CloneSettings):
+    with operation('Cloning', manifest.handle):
+        Repo.clone_from(manifest.remote_url, manifest.location, **settings.clone_options())
+
+    # Shallow clones contain default branch only, so get tags now
+    if settings.depth:
+        manifest.handle.vcs.fetch()
@@ -0,0 +1,31 @@
+from typing import Dict, Optional
+
+from sebex.config.file import ConfigFile
+from sebex.config.format import Format, JsonFormat
+
+
+class BootstrapState(ConfigFile):
+    """
+    Remembers when each imported repository has been last changed on GitHub, so that
+    subsequent bootstraps can skip repositories which have not changed since.
+    """
+
+    _name = 'bootstrap'
+    _data = {
+        'organizations': {}
+    }
+
+    @classmethod
+    def format(cls) -> Format:
+        return JsonFormat()
+
+    @staticmethod
+    def freshness_key(raw: Dict) -> str:
+        """Any push or change of repository settings changes this key."""
+        return f'{raw.get("pushed_at")}/{raw.get("updated_at")}'
+
+    def get(self, organization: str, repo: str) -> Optional[str]:
+        return self._data['organizations'].get(organization, {}).get(repo)
+
+    def replace(self, organization: str, keys: Dict[str, str]):
+        self._data['organizations'][organization] = keys
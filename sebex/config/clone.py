@@ -0,0 +1,47 @@
+from typing import Optional, Dict
+
+from sebex.config.file import ConfigFile
+
+
+class CloneSettings(ConfigFile):
+    """
+    How repositories of the workspace are cloned. Shallow (`depth`) and partial (`filter`)
+    clones are much faster to create and take less disk space. Missing history is fetched
+    by Git on demand (partial clones). Shallow clones are deepened only when full history is
+    requested via `sync --depth 0`, or by release steps which need it.
+    """
+
+    _name = 'clone'
+    _data = {
+        'depth': None,
+        'filter': None,
+    }
+
+    @property
+    def depth(self) -> Optional[int]:
+        return self._data['depth']
+
+    @depth.setter
+    def depth(self, depth: Optional[int]):
+        self._data['depth'] = depth if depth else None
+
+    @property
+    def filter(self) -> Optional[str]:
+        return self._data['filter']
+
+    @filter.setter
+    def filter(self, spec: Optional[str]):
+        self._data['filter'] = spec if spec and spec != 'none' else None
+
+    def clone_options(self) -> Dict:
+        """Options for `git clone`."""
+
+        options = {}
+
+        if self.depth:
+            options['depth'] = self.depth
+
+        if self.filter:
+            options['filter'] = self.filter
+
+        return options
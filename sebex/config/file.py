@@ -1,6 +1,6 @@
 from contextlib import contextmanager
 from copy import deepcopy
-from typing import Type, TypeVar, Optional
+from typing import Type, TypeVar, Optional, List
 
 from sebex.config.format import Format, YamlFormat
 
@@ -27,22 +27,30 @@ class ConfigFile:
     def format(cls) -> Format:
         return YamlFormat()
 
+    @classmethod
+    def legacy_formats(cls) -> List[Format]:
+        """
+        Formats in which this file has been stored previously. They are read if there is no file
+        in current format, and are replaced by current format on next save.
+        """
+        return []
+
     @classmethod
     def exists(cls, name: str = None) -> bool:
         name = cls._get_name(name)
-        full_path = cls.format().full_path(name)
-        return full_path.exists()
+        return any(fmt.full_path(name).exists() for fmt in [cls.format(), *cls.legacy_formats()])
 
     @classmethod
     def open(cls: Type[K], name: str = None) -> 'K':
         name = cls._get_name(name)
-        full_path = cls.format().full_path(name)
 
-        if full_path.exists():
-            with open(full_path, 'r') as f:
-                data = cls.format().load(f)
-        else:
-            data = None
+        data = None
+        for fmt in [cls.format(), *cls.legacy_formats()]:
+            full_path = fmt.full_path(name)
+            if full_path.exists():
+                with open(full_path, 'r') as f:
+                    data = fmt.load(f)
+                break
 
         return cls(name=name, data=data)
 
@@ -50,9 +58,12 @@ class ConfigFile:
         with open(self.format().full_path(self._name), 'w') as f:
             self.format().dump(self._make_data(), f)
 
+        for fmt in self.legacy_formats():
+            fmt.full_path(self._name).unlink(missing_ok=True)
+
     def delete(self):
-        full_path = self.format().full_path(self._name)
-        full_path.unlink()
+        for fmt in [self.format(), *self.legacy_formats()]:
+            fmt.full_path(self._name).unlink(missing_ok=True)
 
     @contextmanager
     def transaction(self: K):
@@ -73,7 +84,7 @@ class ConfigFile:
 
 
 def merge_defaults(base, defaults):
-    return merge_defaults_inner(base, defaults) if base is not None else defaults
+    return merge_defaults_inner(base, defaults) if base is not None else deepcopy(defaults)
 
 
 def merge_defaults_inner(base, defaults):
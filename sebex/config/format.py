@@ -8,6 +8,12 @@ import yaml
 
 from sebex.context import Context
 
+# Prefer libyaml bindings, which are much faster than pure Python implementation
+try:
+    from yaml import CSafeLoader as _YamlLoader, CDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, Dumper as _YamlDumper
+
 
 class Format(ABC):
     @abstractmethod
@@ -47,13 +53,13 @@ class YamlFormat(Format):
         return '.yaml'
 
     def load(self, fp: TextIO):
-        return yaml.safe_load(fp)
+        return yaml.load(fp, Loader=_YamlLoader)
 
     def dump(self, data, fp: TextIO):
         if self.autogenerated:
             fp.write('# File generated automatically. DO NOT EDIT.\n\n')
 
-        yaml.dump(data, fp, default_flow_style=False, sort_keys=False)
+        yaml.dump(data, fp, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
 
 
 class LinesFormat(Format):
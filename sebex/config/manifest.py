@@ -1,11 +1,11 @@
-import re
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
-from typing import Dict, Union, Iterable, List, Optional, TYPE_CHECKING
+from threading import Lock
+from typing import Dict, Union, Iterable, List, Optional, TYPE_CHECKING, Tuple
+from weakref import WeakKeyDictionary
 
 from git import Repo as GitRepo
-from github import Repository as GithubRepository
 
 from sebex.config.file import ConfigFile
 from sebex.context import Context
@@ -14,8 +14,6 @@ from sebex.name_similarity import sorting_key, REPO_NAME_SIMILARITY
 if TYPE_CHECKING:
     from sebex.vcs import Vcs
 
-_GITHUB_SSH_URL = re.compile(r'git@github\.com:(?P<full>(?P<org>[^/]+)/(?P<repo>.+))\.git/?')
-
 
 @dataclass(order=True, unsafe_hash=True)
 class RepositoryHandle:
@@ -120,34 +118,29 @@ class RepositoryManifest:
     projects: List[ProjectManifest]
     default_branch: str = 'master'
 
-    @property
+    @cached_property
     def handle(self) -> RepositoryHandle:
         return RepositoryHandle(self.name)
 
+    @cached_property
+    def _project_handles(self) -> Tuple[ProjectHandle, ...]:
+        return tuple(ProjectHandle(repo=self.handle, path=project.path)
+                     for project in self.projects)
+
     def project(self, path: str) -> ProjectHandle:
-        for project in self.projects:
+        for project in self._project_handles:
             if project.path == path:
-                return ProjectHandle(repo=self.handle, path=project.path)
+                return project
 
         raise KeyError(f'Unknown project: {path}')
 
     def project_handles(self) -> Iterable[ProjectHandle]:
-        for project in self.projects:
-            yield ProjectHandle(repo=self.handle, path=project.path)
+        return iter(self._project_handles)
 
     @property
     def location(self) -> Path:
         return self.handle.location
 
-    # TODO Remove
-    @property
-    def github(self) -> GithubRepository:
-        m = _GITHUB_SSH_URL.match(self.remote_url)
-        if m:
-            return Context.current().github.get_repo(m['full'], lazy=True)
-        else:
-            raise ValueError('Repository is not hosted on GitHub')
-
     def to_raw(self) -> Dict:
         d = {'name': self.name, 'remote_url': self.remote_url}
 
@@ -166,9 +159,11 @@ class RepositoryManifest:
                                   default_branch=raw.get('default_branch', 'master'))
 
     @staticmethod
-    def from_github_repository(repo: GithubRepository) -> 'RepositoryManifest':
-        return RepositoryManifest(name=repo.name, remote_url=repo.ssh_url,
-                                  projects=[ProjectManifest()], default_branch=repo.default_branch)
+    def from_github_raw(raw: Dict) -> 'RepositoryManifest':
+        """Build manifest from repository representation returned by GitHub REST API."""
+        return RepositoryManifest(name=raw['name'], remote_url=raw['ssh_url'],
+                                  projects=[ProjectManifest()],
+                                  default_branch=raw['default_branch'])
 
 
 class Manifest(ConfigFile):
@@ -178,14 +173,49 @@ class Manifest(ConfigFile):
     }
 
     _repository_index: Dict[str, int]
+    _repositories: List[RepositoryManifest]
+    _project_index: Dict[ProjectHandle, ProjectHandle]
 
     def __init__(self, name: Optional[str], data):
         super().__init__(name, data)
 
         self._rebuild_repository_index()
 
+    @classmethod
+    def current(cls) -> 'Manifest':
+        """
+        Get the manifest of current context, loaded once and reloaded only if the file has
+        changed since. The returned instance is shared and must not be modified, use `open`
+        for that.
+        """
+
+        context = Context.current()
+        path = cls.format().full_path(cls._name)
+        try:
+            stat = path.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+
+        with _current_lock:
+            cached = _current.get(context)
+            if cached is None or cached[0] != key:
+                cached = _current[context] = (key, cls.open())
+            return cached[1]
+
+    def save(self) -> None:
+        super().save()
+
+        with _current_lock:
+            _current.pop(Context.current(), None)
+
     def _rebuild_repository_index(self):
         self._repository_index = {r['name']: i for i, r in enumerate(self._data['repositories'])}
+        self._repositories = [RepositoryManifest.from_raw(r) for r in self._data['repositories']]
+        self._project_index = {p: p for r in self._repositories for p in r.project_handles()}
+
+    def find_project(self, handle: ProjectHandle) -> Optional[ProjectHandle]:
+        return self._project_index.get(handle)
 
     def get_repository_by_name(self, name: Union[str, RepositoryHandle]) -> RepositoryManifest:
         repo = self.find_repository_by_name(name)
@@ -204,22 +234,31 @@ class Manifest(ConfigFile):
         if name not in self._repository_index:
             return None
 
-        raw = self._data['repositories'][self._repository_index[name]]
-        return RepositoryManifest.from_raw(raw)
+        return self._repositories[self._repository_index[name]]
 
     def iter_repositories(self) -> Iterable[RepositoryManifest]:
-        for raw in self._data['repositories']:
-            yield RepositoryManifest.from_raw(raw)
+        return iter(self._repositories)
 
     def upsert_repository(self, repo: RepositoryManifest):
         repos = self._data['repositories']
 
         if repo.name in self._repository_index:
-            repos[self._repository_index[repo.name]] = repo.to_raw()
+            index = self._repository_index[repo.name]
+            repos[index] = repo.to_raw()
+            self._repositories[index] = RepositoryManifest.from_raw(repos[index])
         else:
             repos.append(repo.to_raw())
             self._repository_index[repo.name] = len(repos) - 1
+            self._repositories.append(RepositoryManifest.from_raw(repos[-1]))
+
+        self._project_index = {p: p for r in self._repositories for p in r.project_handles()}
 
     def sort_repositories(self):
         self._data['repositories'].sort(key=lambda r: sorting_key(r['name'], REPO_NAME_SIMILARITY))
         self._rebuild_repository_index()
+
+
+# Manifests shared by all users within a context, along with file version they have been read at
+_current: 'WeakKeyDictionary[Context, Tuple[Optional[Tuple[int, int]], Manifest]]' = \
+    WeakKeyDictionary()
+_current_lock = Lock()
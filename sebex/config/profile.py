@@ -66,7 +66,7 @@ def current_profile() -> Profile:
 
 def current_repositories() -> Iterable[RepositoryManifest]:
     profile = current_profile()
-    manifest = Manifest.open()
+    manifest = Manifest.current()
     return profile.apply(manifest)
 
 
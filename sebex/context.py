@@ -1,10 +1,21 @@
+import os
 from contextlib import contextmanager
 from contextvars import ContextVar
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Set
 
-from github import Github
+if TYPE_CHECKING:
+    from sebex.github_api import GithubClient
 
 METADATA_DIRECTORY_NAME = '.sebex'
+DEFAULT_HEX_API_URL = 'https://hex.pm/api'
+DEFAULT_GITHUB_API_URL = 'https://api.github.com'
+
+# Rough upper bound of memory used by single analyzer worker (a BEAM VM evaluating mix.exs)
+ANALYZER_WORKER_MEMORY = 512 * 1024 * 1024
+
+_MEMINFO_PATH = '/proc/meminfo'
 
 _context_var = ContextVar('sebex_context')
 
@@ -12,17 +23,48 @@ _context_var = ContextVar('sebex_context')
 class Context:
     workspace_path: Path
     profile_name: str
-    github: Github
+    github_access_token: str
+    github_api_url: str
     jobs: int
+    analyze_jobs: int
+    git_jobs: int
+    net_jobs: int
     assume_yes: bool
+    hex_api_url: str
 
     def __init__(self, workspace: str, profile: str, github_access_token: str, jobs: int,
-                 assumeyes: bool) -> None:
+                 assumeyes: bool, hex_api_url: str = DEFAULT_HEX_API_URL,
+                 github_api_url: str = DEFAULT_GITHUB_API_URL,
+                 analyze_jobs: Optional[int] = None, git_jobs: Optional[int] = None,
+                 net_jobs: Optional[int] = None) -> None:
         self.workspace_path = Path(workspace)
         self.profile_name = profile
-        self.github = Github(github_access_token)
+        self.github_access_token = github_access_token
+        self.github_api_url = github_api_url
         self.jobs = jobs
+        self.analyze_jobs = analyze_jobs if analyze_jobs is not None \
+            else default_analyze_jobs(jobs)
+        self.git_jobs = git_jobs if git_jobs is not None else jobs
+        self.net_jobs = net_jobs if net_jobs is not None else jobs
         self.assume_yes = assumeyes
+        self.hex_api_url = hex_api_url
+
+    @cached_property
+    def github_api(self) -> 'GithubClient':
+        from sebex.github_api import GithubClient
+        return GithubClient(self.github_access_token, api_url=self.github_api_url,
+                            pool_size=self.net_jobs)
+
+    @cached_property
+    def fetched_repositories(self) -> Set[Path]:
+        """Locations of repositories which have been fetched from remote during this run."""
+        return set()
+
+    def close(self):
+        """Persist caches gathered during this context lifetime."""
+
+        if 'github_api' in self.__dict__:
+            self.github_api.save()
 
     @classmethod
     def current(cls) -> 'Context':
@@ -44,3 +86,44 @@ class Context:
     @property
     def meta_path(self) -> Path:
         return self.workspace_path / METADATA_DIRECTORY_NAME
+
+
+def default_jobs() -> int:
+    """Same as the default number of workers of `ThreadPoolExecutor`."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def default_analyze_jobs(jobs: int) -> int:
+    """
+    Analyzer workers are CPU and memory hungry, so run at most one per core,
+    and no more than fits in available memory.
+    """
+
+    limit = min(jobs, os.cpu_count() or 1)
+
+    memory = _available_memory()
+    if memory is not None:
+        limit = min(limit, memory // ANALYZER_WORKER_MEMORY)
+
+    return max(1, limit)
+
+
+def _available_memory() -> Optional[int]:
+    """
+    Memory available for new processes, including reclaimable page cache, as estimated by Linux.
+    Elsewhere, falls back to total physical memory.
+    """
+
+    try:
+        with open(_MEMINFO_PATH) as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    # Reported in kibibytes
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
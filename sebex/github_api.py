@@ -0,0 +1,245 @@
+import time
+from threading import Lock
+from typing import Dict, Any, Optional, Tuple, Callable, List
+from urllib.parse import urlsplit, parse_qs, urlencode, urlunsplit
+
+import requests
+from github import GithubException
+from requests.adapters import HTTPAdapter
+
+from sebex.config.file import ConfigFile
+from sebex.config.format import Format, JsonFormat
+from sebex.context import DEFAULT_GITHUB_API_URL
+from sebex.jobs import for_each, JobKind
+
+_TIMEOUT = 60
+
+# Maximum number of responses kept in the ETag cache, the oldest ones are dropped first
+_CACHE_SIZE = 2000
+
+
+class GithubCache(ConfigFile):
+    """
+    Persistent cache of GitHub REST API responses, revalidated using `ETag` headers.
+    Conditional requests answered with `304 Not Modified` do not count against the rate limit.
+    """
+
+    _name = 'github_cache'
+    _data = {
+        'responses': {}
+    }
+
+    @classmethod
+    def format(cls) -> Format:
+        return JsonFormat()
+
+    def get(self, url: str) -> Optional[Dict]:
+        return self._data['responses'].get(url)
+
+    def put(self, url: str, etag: str, body: Any, links: Dict[str, str]):
+        responses = self._data['responses']
+        responses.pop(url, None)
+        responses[url] = {'etag': etag, 'body': body, 'links': links}
+
+        while len(responses) > _CACHE_SIZE:
+            del responses[next(iter(responses))]
+
+
+class RateLimiter:
+    """
+    Paces requests made by all threads to the remaining rate limit budget, as reported
+    by `X-RateLimit-*` response headers. While the budget is plentiful, requests are not delayed.
+    Below `pace_below` remaining requests, they are spread evenly until the limit resets,
+    and when only `reserve` requests remain, everyone waits for the reset.
+    """
+
+    def __init__(self, pace_below: int = 500, reserve: int = 10,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._pace_below = pace_below
+        self._reserve = reserve
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = Lock()
+        self._remaining: Optional[int] = None
+        self._reset: Optional[float] = None
+        self._next_slot = 0.0
+
+    def update(self, headers: Dict[str, str]):
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset = float(headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+
+        with self._lock:
+            # Responses to concurrent requests may arrive out of order
+            if self._reset is None or reset > self._reset or remaining < self._remaining:
+                self._remaining = remaining
+                self._reset = reset
+
+    def acquire(self):
+        """Block until the calling thread is allowed to perform a request."""
+
+        with self._lock:
+            now = self._clock()
+
+            if self._remaining is None or self._reset is None or now >= self._reset:
+                return
+
+            if self._remaining <= self._reserve:
+                delay = self._reset - now
+            elif self._remaining < self._pace_below:
+                slot = max(self._next_slot, now)
+                self._next_slot = slot + (self._reset - now) / (self._remaining - self._reserve)
+                delay = slot - now
+            else:
+                return
+
+            self._remaining -= 1
+
+        if delay > 0:
+            self._sleep(delay)
+
+
+class GithubClient:
+    """
+    Shared access layer to GitHub API. All threads share single pool of keep-alive connections,
+    rate limit pacing and persistent ETag cache.
+    """
+
+    def __init__(self, access_token: str, api_url: str = DEFAULT_GITHUB_API_URL,
+                 pool_size: int = 10, limiter: Optional[RateLimiter] = None):
+        self.api_url = api_url.rstrip('/')
+        self.limiter = limiter if limiter is not None else RateLimiter()
+
+        self._session = requests.Session()
+        self._session.headers.update({
+            'Accept': 'application/vnd.github.v3+json',
+            'Authorization': f'token {access_token}',
+            'User-Agent': 'sebex',
+        })
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        self._cache: Optional[GithubCache] = None
+        self._cache_dirty = False
+        self._lock = Lock()
+
+    @property
+    def graphql_url(self) -> str:
+        # GitHub Enterprise serves REST API at /api/v3 and GraphQL at /api/graphql
+        if self.api_url.endswith('/v3'):
+            return self.api_url[:-len('/v3')] + '/graphql'
+        return self.api_url + '/graphql'
+
+    def get(self, url: str) -> Tuple[Any, bool]:
+        """
+        Fetch JSON resource, given either an absolute URL or a path relative to API root.
+        Previously fetched copies are revalidated. Returns the resource and whether
+        it changed since it has been cached.
+        """
+
+        body, changed, _ = self._get(url)
+        return body, changed
+
+    def get_all(self, url: str) -> Tuple[List, bool]:
+        """
+        Fetch all pages of a paginated collection. The first page tells how many pages there are,
+        the rest is fetched concurrently. Returns all items and whether any page has changed.
+        """
+
+        first, changed, links = self._get(url)
+        if 'last' not in links:
+            return first, changed
+
+        last = urlsplit(links['last'])
+        query = parse_qs(last.query)
+        page_urls = [urlunsplit(last._replace(query=urlencode({**query, 'page': page}, doseq=True)))
+                     for page in range(2, int(query['page'][0]) + 1)]
+
+        pages = for_each(page_urls, self._get, desc='Fetching page', kind=JobKind.NETWORK)
+
+        items = list(first)
+        for body, page_changed, _ in pages:
+            items.extend(body)
+            changed = changed or page_changed
+
+        return items, changed
+
+    def post(self, url: str, json: Any = None) -> Any:
+        """Create a resource, returns the response body. Modifying requests are never cached."""
+        return self._request('POST', self._absolute(url), json=json).json()
+
+    def put(self, url: str, json: Any = None) -> Any:
+        """Replace a resource or perform an action, returns the response body."""
+        return self._request('PUT', self._absolute(url), json=json).json()
+
+    def graphql(self, query: str, variables: Dict) -> Dict:
+        response = self._request('POST', self.graphql_url,
+                                 json={'query': query, 'variables': variables})
+        body = response.json()
+
+        if body.get('errors'):
+            raise GithubException(response.status_code, body)
+
+        return body['data']
+
+    def save(self):
+        with self._lock:
+            if self._cache is not None and self._cache_dirty:
+                self._cache.save()
+                self._cache_dirty = False
+
+    def _get(self, url: str) -> Tuple[Any, bool, Dict[str, str]]:
+        url = self._absolute(url)
+        cached = self._cache_get(url)
+
+        headers = {'If-None-Match': cached['etag']} if cached is not None else {}
+        response = self._request('GET', url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            return cached['body'], False, cached.get('links', {})
+
+        body = response.json()
+        links = {rel: link['url'] for rel, link in response.links.items()}
+        etag = response.headers.get('ETag')
+        if etag:
+            self._cache_put(url, etag, body, links)
+
+        return body, True, links
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        # Retry once if secondary rate limit has been hit
+        for attempt in range(2):
+            self.limiter.acquire()
+            response = self._session.request(method, url, timeout=_TIMEOUT, **kwargs)
+            self.limiter.update(response.headers)
+
+            if response.status_code in (403, 429) and 'Retry-After' in response.headers \
+                    and attempt == 0:
+                time.sleep(float(response.headers['Retry-After']))
+                continue
+
+            if response.status_code >= 400:
+                raise GithubException(response.status_code,
+                                      response.json() if response.content else None)
+
+            return response
+
+    def _absolute(self, url: str) -> str:
+        if url.startswith(('http://', 'https://')):
+            return url
+        return f'{self.api_url}/{url.lstrip("/")}'
+
+    def _cache_get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            if self._cache is None:
+                self._cache = GithubCache.open()
+            return self._cache.get(url)
+
+    def _cache_put(self, url: str, etag: str, body: Any, links: Dict[str, str]):
+        with self._lock:
+            self._cache.put(url, etag, body, links)
+            self._cache_dirty = True
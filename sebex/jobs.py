@@ -1,5 +1,12 @@
+import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from typing import TypeVar, Iterable, Callable, List, Optional
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from enum import Enum
+from threading import Event, Lock, BoundedSemaphore
+from typing import TypeVar, Iterable, Callable, List, Optional, Generic, AsyncIterator, Dict, \
+    Tuple, FrozenSet
 
 from sebex.context import Context
 from sebex.log import error
@@ -7,18 +14,87 @@ from sebex.log import error
 T = TypeVar('T')
 R = TypeVar('R')
 
+_held_kinds_var: ContextVar[FrozenSet['JobKind']] = ContextVar('sebex_held_job_kinds')
+_cancel_var: ContextVar[Event] = ContextVar('sebex_job_cancel')
+
+_semaphores: Dict[Tuple['JobKind', int], BoundedSemaphore] = {}
+_semaphores_lock = Lock()
+
+# How often jobs waiting for a free slot check whether they have been cancelled, in seconds
+_CANCEL_POLL_INTERVAL = 0.1
+
 
 class JobError(Exception):
-    pass
+    def __init__(self, *args, failures: Optional[List['JobResult']] = None):
+        super().__init__(*args)
+        self.failures = failures if failures is not None else []
 
 
-def for_each(iterable: Iterable[T], f: Callable[[T], R],
-             desc: str, item_desc: Callable[[T], Optional[str]] = str) -> List[R]:
-    context = Context.current()
+class JobKind(Enum):
+    """
+    What kind of resource jobs are bound by. Each kind has its own concurrency limit,
+    shared by all jobs of this kind running in the process. Jobs not bound by any specific
+    resource are `GENERAL`, limited by the number of jobs set by the user.
+    """
+
+    GENERAL = 'general'
+    ANALYZE = 'analyze'
+    GIT = 'git'
+    NETWORK = 'network'
+
+    def limit(self) -> int:
+        context = Context.current()
+        return {
+            JobKind.GENERAL: context.jobs,
+            JobKind.ANALYZE: context.analyze_jobs,
+            JobKind.GIT: context.git_jobs,
+            JobKind.NETWORK: context.net_jobs,
+        }[self]
+
+
+@dataclass(frozen=True)
+class JobResult(Generic[T, R]):
+    index: int
+    item: T
+    desc: str
+    value: Optional[R] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def cancellation() -> Optional[Event]:
+    """Event which is set when the job being run by calling thread should stop."""
+    return _cancel_var.get(None)
+
+
+async def run_jobs(iterable: Iterable[T], f: Callable[[T], R],
+                   desc: str, item_desc: Callable[[T], Optional[str]] = str,
+                   kind: JobKind = JobKind.GENERAL,
+                   jobs: Optional[int] = None) -> AsyncIterator[JobResult[T, R]]:
+    """
+    Run `f` for each item in worker threads, yielding results in order of completion.
+    Failures do not stop other jobs, they are yielded as results holding the error.
+
+    Concurrency is bounded by the limit of job `kind`, unless `jobs` is given explicitly.
+    Jobs of a kind nested in a job of the same kind do not take another slot of the shared limit.
+
+    Each job sees the context variables (including current `Context`) of the caller.
+    When the caller stops consuming results, or is cancelled, jobs which have not started yet
+    are dropped and the running ones are signalled through `cancellation()`.
+    """
 
     whole_iterable = list(iterable)
+    if not whole_iterable:
+        return
+
+    context = Context.current()
+    limit = jobs if jobs is not None else kind.limit()
+    cancel = Event()
 
-    def run(item: T) -> R:
+    def run(index: int, item: T) -> JobResult[T, R]:
         this_item_desc = item_desc(item)
 
         if this_item_desc is not None:
@@ -27,13 +103,95 @@ def for_each(iterable: Iterable[T], f: Callable[[T], R],
             job_desc = desc
 
         try:
-            with Context.activate(context):
-                return f(item)
-        except KeyboardInterrupt:
-            raise
+            _cancel_var.set(cancel)
+            with Context.activate(context), _slot(kind, shared=jobs is None, cancel=cancel):
+                return JobResult(index, item, job_desc, value=f(item))
         except Exception as e:
-            error(f'Job "{job_desc}" failed!')
-            raise JobError(job_desc) from e
+            if not cancel.is_set():
+                error(f'Job "{job_desc}" failed!')
+            return JobResult(index, item, job_desc, error=e)
+
+    executor = ThreadPoolExecutor(max_workers=min(limit, len(whole_iterable)))
+    futures = [executor.submit(copy_context().run, run, index, item)
+               for index, item in enumerate(whole_iterable)]
+    try:
+        for future in asyncio.as_completed([asyncio.wrap_future(f) for f in futures]):
+            yield await future
+    finally:
+        cancel.set()
+        # Drop jobs which have not started yet
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def for_each(iterable: Iterable[T], f: Callable[[T], R],
+             desc: str, item_desc: Callable[[T], Optional[str]] = str,
+             jobs: Optional[int] = None, kind: JobKind = JobKind.GENERAL,
+             keep_going: bool = False) -> List[R]:
+    """
+    Run `f` for each item concurrently and return results in the order of items.
+
+    By default, the first failure cancels jobs which have not started yet and is raised as
+    `JobError`. With `keep_going`, all jobs are run to completion and failures are reported
+    together at the end.
+    """
+
+    async def collect() -> List[JobResult[T, R]]:
+        results = []
+
+        async with _closing(run_jobs(iterable, f, desc, item_desc, kind, jobs)) as stream:
+            async for result in stream:
+                if not result.ok and not keep_going:
+                    raise JobError(result.desc, failures=[result]) from result.error
+                results.append(result)
+
+        return sorted(results, key=lambda r: r.index)
+
+    results = asyncio.run(collect())
+
+    failures = [r for r in results if not r.ok]
+    if failures:
+        error(f'{len(failures)} of {len(results)} jobs failed:')
+        for failure in failures:
+            error(f'  {failure.desc}: {failure.error}')
+        raise JobError(f'{len(failures)} jobs failed', failures=failures) from failures[0].error
+
+    return [r.value for r in results]
+
+
+@asynccontextmanager
+async def _closing(gen: AsyncIterator):
+    """Close async generator on exit, like `contextlib.aclosing` available since Python 3.10."""
+    try:
+        yield gen
+    finally:
+        await gen.aclose()
+
+
+@contextmanager
+def _slot(kind: JobKind, shared: bool, cancel: Event):
+    held = _held_kinds_var.get(frozenset())
+    if not shared or kind in held:
+        yield
+        return
+
+    semaphore = _semaphore(kind, kind.limit())
+    while not semaphore.acquire(timeout=_CANCEL_POLL_INTERVAL):
+        if cancel.is_set():
+            raise asyncio.CancelledError()
+
+    token = _held_kinds_var.set(held | {kind})
+    try:
+        yield
+    finally:
+        _held_kinds_var.reset(token)
+        semaphore.release()
+
 
-    with ThreadPoolExecutor(max_workers=context.jobs) as executor:
-        return list(executor.map(run, whole_iterable))
+def _semaphore(kind: JobKind, limit: int) -> BoundedSemaphore:
+    with _semaphores_lock:
+        semaphore = _semaphores.get((kind, limit))
+        if semaphore is None:
+            semaphore = _semaphores[(kind, limit)] = BoundedSemaphore(limit)
+        return semaphore
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Dict
 
-from sebex.analysis.model import Language, AnalysisEntry, DependencyUpdate
+from sebex.analysis.model import Language, AnalysisEntry, DependencyUpdate, Release
 from sebex.analysis.version import Version
+from sebex.checksum import Checksum
 from sebex.config.manifest import ProjectHandle
 from sebex.edit.span import Span
+from sebex.jobs import for_each, JobKind
 
 
 class LanguageSupport(ABC):
@@ -16,9 +18,29 @@ class LanguageSupport(ABC):
     @abstractmethod
     def test_project(cls, project: ProjectHandle) -> bool: ...
 
+    @abstractmethod
+    def fingerprint(self, project: ProjectHandle) -> Checksum:
+        """
+        Compute a checksum of everything `analyze` depends on, so that analysis results can be
+        reused as long as the fingerprint stays the same.
+        """
+        ...
+
     @abstractmethod
     def analyze(self, project: ProjectHandle) -> AnalysisEntry: ...
 
+    def analyze_many(self, projects: List[ProjectHandle]) -> List[AnalysisEntry]:
+        """Analyze multiple projects at once, results are returned in the same order."""
+        return for_each(projects, self.analyze, desc='Analyzing', kind=JobKind.ANALYZE)
+
+    @abstractmethod
+    def fetch_releases(self, packages: List[str]) -> Dict[str, List[Release]]:
+        """
+        Fetch published releases of given packages from package registry. Unpublished packages
+        may be omitted from the result.
+        """
+        ...
+
     @abstractmethod
     def write_release(self, project: ProjectHandle, to_version: Version, to_version_span: Span,
                       dependency_updates: List[DependencyUpdate]): ...
@@ -1,16 +1,23 @@
-import json
+import atexit
 import os
+from contextlib import ExitStack
+from functools import lru_cache
 from importlib import resources
 from pathlib import Path
-from typing import List
+from typing import List, Dict
 
-from sebex.analysis.model import AnalysisEntry, Dependency, Release, Language, DependencyUpdate
+from sebex.analysis.model import AnalysisEntry, Dependency, Release, Language, DependencyUpdate, \
+    AnalysisError
 from sebex.analysis.version import VersionSpec, Version
+from sebex.checksum import Checksum
 from sebex.cli import confirm
 from sebex.config.manifest import ProjectHandle
+from sebex.context import Context
 from sebex.edit.patch import patch_file
 from sebex.edit.span import Span
 from sebex.language.abc import LanguageSupport
+from sebex.language.elixir.hex import fetch_hex_releases
+from sebex.language.elixir.pool import analyzer_pool
 from sebex.log import operation, warn, fatal
 from sebex.popen import popen
 
@@ -23,6 +30,20 @@ def mix_lock(project: ProjectHandle) -> Path:
     return project.location / 'mix.lock'
 
 
+_resources = ExitStack()
+atexit.register(_resources.close)
+
+
+@lru_cache(maxsize=None)
+def analyzer_executable() -> Path:
+    return _resources.enter_context(resources.path(__name__, 'elixir_analyzer'))
+
+
+@lru_cache(maxsize=None)
+def analyzer_version() -> Checksum:
+    return Checksum.of(analyzer_executable().read_bytes())
+
+
 class ElixirLanguageSupport(LanguageSupport):
     @classmethod
     def language(cls) -> Language:
@@ -32,11 +53,21 @@ class ElixirLanguageSupport(LanguageSupport):
     def test_project(cls, project: ProjectHandle) -> bool:
         return mix_file(project).exists()
 
+    def fingerprint(self, project: ProjectHandle) -> Checksum:
+        # Git object ID of mix.exs is cheap to compute and stable across checkouts
+        return Checksum.of([str(analyzer_version()), str(Checksum.of_git_blob(mix_file(project)))])
+
     def analyze(self, project: ProjectHandle) -> AnalysisEntry:
-        with resources.path(__name__, 'elixir_analyzer') as elixir_analyzer:
-            proc = popen([elixir_analyzer, '--mix', mix_file(project)])
-            raw = json.loads(proc.stdout)
+        pool = analyzer_pool(analyzer_executable(), Context.current().analyze_jobs)
+        raw = pool.analyze(mix_file(project))
 
+        if 'error' in raw:
+            raise AnalysisError(f'Failed to analyze project {project}: {raw["error"]}')
+
+        return self._load_report(raw['report'])
+
+    @classmethod
+    def _load_report(cls, raw: Dict) -> AnalysisEntry:
         package = raw['package']
         version = Version.parse(raw['version'])
         version_span = Span.from_raw(raw['version_span'])
@@ -50,20 +81,11 @@ class ElixirLanguageSupport(LanguageSupport):
             )
             for dep in raw['dependencies']]
 
-        hex_info = raw['hex']
-        if hex_info['published']:
-            def load_release(rel):
-                return Release(
-                    version=Version.parse(rel['version']),
-                    retired=bool(rel.get('retired', False))
-                )
-
-            releases = list(map(load_release, hex_info['versions']))
-        else:
-            releases = []
-
         return AnalysisEntry(package=package, version=version, version_span=version_span,
-                             dependencies=dependencies, releases=releases)
+                             dependencies=dependencies)
+
+    def fetch_releases(self, packages: List[str]) -> Dict[str, List[Release]]:
+        return fetch_hex_releases(packages)
 
     def write_release(self, project: ProjectHandle, to_version: Version, to_version_span: Span,
                       dependencies: List[DependencyUpdate]):
@@ -0,0 +1,122 @@
+from functools import partial
+from typing import Dict, List, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from sebex.analysis.model import Release, AnalysisError
+from sebex.analysis.version import Version
+from sebex.config.file import ConfigFile
+from sebex.config.format import Format, JsonFormat
+from sebex.context import Context
+from sebex.jobs import for_each, JobKind
+from sebex.log import operation, warn
+
+_TIMEOUT = 30
+
+
+class HexCache(ConfigFile):
+    """
+    Persistent cache of Hex package information. Cached responses are revalidated using
+    `ETag` and `Last-Modified` headers, and are used as a fallback when Hex is unreachable.
+    """
+
+    _name = 'hex_cache'
+    _data = {
+        'packages': {}
+    }
+
+    @classmethod
+    def format(cls) -> Format:
+        return JsonFormat()
+
+    def get(self, package: str) -> Optional[Dict]:
+        return self._data['packages'].get(package)
+
+    def put(self, package: str, raw: Dict):
+        self._data['packages'][package] = raw
+
+
+def fetch_hex_releases(packages: Iterable[str]) -> Dict[str, List[Release]]:
+    """
+    Fetch releases of all given packages from Hex concurrently.
+    Private (unpublished) packages are mapped to an empty list.
+    """
+
+    packages = sorted(set(packages))
+    if not packages:
+        return {}
+
+    with operation('Fetching package information from Hex'):
+        cache = HexCache.open()
+
+        with _session(pool_size=Context.current().net_jobs) as session:
+            results = for_each(packages, partial(_fetch_package, session, cache),
+                               desc='Fetching Hex package', kind=JobKind.NETWORK)
+
+        cache.save()
+
+    return {pkg: [Release.from_raw(r) for r in raw['releases']]
+            for pkg, raw in zip(packages, results)}
+
+
+def _session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    session.headers.update({'Accept': 'application/json', 'User-Agent': 'sebex'})
+
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def _fetch_package(session: requests.Session, cache: HexCache, package: str) -> Dict:
+    cached = cache.get(package)
+
+    headers = {}
+    if cached is not None:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    url = f'{Context.current().hex_api_url.rstrip("/")}/packages/{package}'
+
+    try:
+        response = session.get(url, headers=headers, timeout=_TIMEOUT)
+    except requests.RequestException as e:
+        if cached is not None:
+            warn(f'Failed to reach Hex ({e}), using cached information about {package}.')
+            return cached
+        else:
+            raise AnalysisError(f'Failed to fetch Hex package info for {package}: {e}')
+
+    if response.status_code == 304 and cached is not None:
+        return cached
+
+    if response.status_code == 404:
+        raw = {'releases': []}
+    elif response.ok:
+        raw = {'releases': _parse_releases(response.json())}
+    elif cached is not None:
+        warn(f'Hex responded with {response.status_code},',
+             f'using cached information about {package}.')
+        return cached
+    else:
+        raise AnalysisError(f'Failed to fetch Hex package info for {package}: '
+                            f'HTTP {response.status_code}')
+
+    raw['etag'] = response.headers.get('ETag')
+    raw['last_modified'] = response.headers.get('Last-Modified')
+    cache.put(package, raw)
+    return raw
+
+
+def _parse_releases(body: Dict) -> List[Dict]:
+    retirements = set(body.get('retirements', {}).keys())
+
+    return [
+        Release(version=Version.parse(r['version']), retired=r['version'] in retirements).to_raw()
+        for r in body['releases']
+    ]
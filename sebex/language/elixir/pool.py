@@ -0,0 +1,214 @@
+import atexit
+import json
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from queue import LifoQueue, Queue, Empty
+from threading import Lock, Thread
+from typing import Dict, Optional, List, Iterator, TextIO
+
+from sebex.analysis.model import AnalysisError
+
+# Prefix of server response lines, telling them apart from output of evaluated mix.exs files
+REPLY_MARKER = '\x1esebex:'
+
+# How long a single analysis may take, before the worker is considered stuck and killed
+REQUEST_TIMEOUT = 120
+
+
+class WorkerCrashed(Exception):
+    pass
+
+
+class WorkerTimedOut(Exception):
+    pass
+
+
+class AnalyzerWorker:
+    """
+    A long-lived analyzer process running in server mode. Requests and responses are JSON
+    objects, one per line, exchanged over process standard input and output. Responses are
+    prefixed with `REPLY_MARKER`, anything else printed by the process is ignored.
+
+    The worker is not thread-safe, it has to be used by one thread at a time.
+    """
+
+    def __init__(self, executable: Path, timeout: float = REQUEST_TIMEOUT):
+        self._executable = executable
+        self._timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: Optional[Queue] = None
+        self._next_id = 0
+
+    @property
+    def is_alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def request(self, mix: Path) -> Dict:
+        """
+        Send analysis request to the worker and wait for response. The worker is (re)started
+        if needed, and a request which hit a crashed worker is retried once on a fresh one.
+        A worker which does not respond in time is killed, to be restarted by the next request.
+        """
+
+        try:
+            return self._do_request(mix)
+        except WorkerCrashed:
+            self.close()
+        except WorkerTimedOut:
+            self.close(kill=True)
+            raise AnalysisError(f'Analyzer worker timed out while analyzing {mix}')
+
+        try:
+            return self._do_request(mix)
+        except WorkerCrashed as e:
+            self.close()
+            raise AnalysisError(f'Analyzer worker crashed while analyzing {mix}: {e}')
+        except WorkerTimedOut:
+            self.close(kill=True)
+            raise AnalysisError(f'Analyzer worker timed out while analyzing {mix}')
+
+    def _do_request(self, mix: Path) -> Dict:
+        if not self.is_alive:
+            self._spawn()
+
+        self._next_id += 1
+        request_id = self._next_id
+
+        try:
+            self._proc.stdin.write(json.dumps({'id': request_id, 'mix': str(mix)}) + '\n')
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerCrashed(str(e))
+
+        deadline = time.monotonic() + self._timeout
+
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except Empty:
+                raise WorkerTimedOut()
+
+            if line is None:
+                raise WorkerCrashed(f'exit code {self._proc.wait()}')
+
+            # Evaluated mix.exs files are free to print anything, even without trailing newline
+            marker = line.rfind(REPLY_MARKER)
+            if marker < 0:
+                continue
+
+            try:
+                response = json.loads(line[marker + len(REPLY_MARKER):])
+            except ValueError:
+                continue
+
+            if isinstance(response, dict) and response.get('id') == request_id:
+                return response
+
+    def _spawn(self):
+        # Package registry information is fetched separately, in bulk
+        self._proc = subprocess.Popen([self._executable, '--no-hex', '--server'],
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      encoding='utf-8', bufsize=1)
+
+        # Output is read by a separate thread, so that waiting for response can time out
+        self._lines = Queue()
+        Thread(target=_pump_lines, args=(self._proc.stdout, self._lines), daemon=True).start()
+
+    def close(self, kill: bool = False):
+        if self._proc is None:
+            return
+
+        proc, self._proc = self._proc, None
+
+        if kill:
+            proc.kill()
+
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def _pump_lines(stream: TextIO, lines: Queue):
+    """Move lines of the stream to the queue, until end of stream which is marked by `None`."""
+
+    with stream:
+        for line in stream:
+            lines.put(line)
+
+    lines.put(None)
+
+
+class AnalyzerPool:
+    """
+    A bounded pool of analyzer workers. Workers are spawned lazily, when there are no idle ones
+    and the pool is not full yet, and are kept warm until the pool is closed.
+    """
+
+    def __init__(self, executable: Path, size: int, timeout: float = REQUEST_TIMEOUT):
+        self._executable = executable
+        self._size = size
+        self._timeout = timeout
+        self._workers: List[AnalyzerWorker] = []
+        self._idle: LifoQueue = LifoQueue()
+        self._lock = Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def analyze(self, mix: Path) -> Dict:
+        with self._checkout() as worker:
+            return worker.request(mix)
+
+    @contextmanager
+    def _checkout(self) -> Iterator[AnalyzerWorker]:
+        worker = self._acquire()
+        try:
+            yield worker
+        finally:
+            self._idle.put(worker)
+
+    def _acquire(self) -> AnalyzerWorker:
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+
+        with self._lock:
+            if len(self._workers) < self._size:
+                worker = AnalyzerWorker(self._executable, self._timeout)
+                self._workers.append(worker)
+                return worker
+
+        return self._idle.get()
+
+    def close(self):
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+
+
+_pool: Optional[AnalyzerPool] = None
+_pool_lock = Lock()
+
+
+def analyzer_pool(executable: Path, size: int) -> AnalyzerPool:
+    """Get process-wide analyzer pool, creating it on first use."""
+
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = AnalyzerPool(executable, size)
+            atexit.register(_pool.close)
+
+        return _pool
@@ -1,18 +1,30 @@
 from contextlib import contextmanager
 from contextvars import ContextVar
 from itertools import chain
-from typing import NoReturn, Optional, List
+from threading import Lock
+from typing import NoReturn, Optional, List, Iterator
 
 import click
 
 _logcontext_var = ContextVar('sebex_logcontext')
+_buffer_var = ContextVar('sebex_log_buffer')
+_echo_lock = Lock()
 
 
 def log(*msg, color=None):
-    click.echo(' '.join(chain(
+    _emit([' '.join(chain(
         (click.style(f'[{c}]', fg='bright_black') for c in _logcontext_var.get([])),
         (click.style(str(m), fg=color) for m in msg)
-    )))
+    ))])
+
+
+def _emit(lines: List[str]):
+    buffer: Optional[List[str]] = _buffer_var.get(None)
+    if buffer is not None:
+        buffer.extend(lines)
+    else:
+        with _echo_lock:
+            click.echo('\n'.join(lines))
 
 
 def success(*msg):
@@ -62,3 +74,20 @@ def logcontext(ctx: str):
         yield None
     finally:
         _logcontext_var.reset(token)
+
+
+@contextmanager
+def buffered() -> Iterator[List[str]]:
+    """
+    Hold back all lines logged within, and print them all at once when leaving,
+    so that output of concurrently running jobs does not interleave.
+    """
+
+    lines: List[str] = []
+    token = _buffer_var.set(lines)
+    try:
+        yield lines
+    finally:
+        _buffer_var.reset(token)
+        if lines:
+            _emit(lines)
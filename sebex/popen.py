@@ -1,12 +1,51 @@
+import codecs
+import os
+import selectors
 import subprocess
+import time
+from collections import deque
 from os import PathLike
-from typing import List, Union
+from threading import Event
+from typing import List, Union, Optional, Deque, Callable
 
+from sebex.jobs import cancellation
 from sebex.log import logcontext, log, warn, error
 
+# Number of trailing lines of each stream kept in memory by streaming mode
+TAIL_LINES = 1000
+
+# How often the streaming loop checks for timeout and cancellation, in seconds
+_POLL_INTERVAL = 0.1
+
+# How long a terminated process is given to exit, before it is killed
+_TERMINATE_GRACE = 5
+
+
+class ProcessCancelled(subprocess.SubprocessError):
+    def __init__(self, cmd):
+        super().__init__(f'Command {cmd!r} has been cancelled')
+        self.cmd = cmd
+
 
 def popen(args: Union[str, PathLike, List[str]], log_stdout: bool = False, check = True,
+          timeout: Optional[float] = None, cancel: Optional[Event] = None,
           **kwargs) -> subprocess.CompletedProcess:
+    """
+    Run a command to completion.
+
+    If `log_stdout` is set, the output is streamed: lines of both standard output and standard
+    error are logged as soon as they arrive (the latter as warnings), and only the last
+    `TAIL_LINES` lines of each stream are kept, to be returned. Otherwise the whole output is
+    captured and reported on failure.
+
+    The process is terminated if it does not finish within `timeout` seconds, raising
+    `subprocess.TimeoutExpired`, or once the `cancel` event is set, raising `ProcessCancelled`.
+    Inside jobs, the cancellation event of the job is used by default.
+    """
+
+    if cancel is None:
+        cancel = cancellation()
+
     if isinstance(args, str):
         lc = args
     else:
@@ -16,19 +55,103 @@ def popen(args: Union[str, PathLike, List[str]], log_stdout: bool = False, check
 
     with logcontext(lc):
         try:
-            proc = subprocess.run(args, stdin=subprocess.DEVNULL, capture_output=True,
-                                  check=check, encoding='utf-8', **kwargs)
-            if log_stdout:
-                for line in proc.stdout.splitlines():
-                    log(line)
+            if log_stdout or cancel is not None:
+                proc = _stream(args, log_stdout, timeout, cancel, **kwargs)
+                if check:
+                    proc.check_returncode()
+            else:
+                proc = subprocess.run(args, stdin=subprocess.DEVNULL, capture_output=True,
+                                      check=check, timeout=timeout, encoding='utf-8', **kwargs)
             return proc
         except subprocess.CalledProcessError as e:
-            if e.stdout:
-                for line in e.stdout.splitlines():
+            # Streamed output has already been logged
+            if not log_stdout:
+                for line in (e.stdout or '').splitlines():
                     warn(line)
 
-            if e.stderr:
-                for line in e.stderr.splitlines():
+                for line in (e.stderr or '').splitlines():
                     error(line)
 
             raise
+
+
+def _stream(args, log_stdout: bool, timeout: Optional[float], cancel: Optional[Event],
+            **kwargs) -> subprocess.CompletedProcess:
+    # Output which is not logged is returned whole, as the caller is going to process it
+    stdout_tail: Deque[str] = deque(maxlen=TAIL_LINES if log_stdout else None)
+    stderr_tail: Deque[str] = deque(maxlen=TAIL_LINES if log_stdout else None)
+
+    def on_stdout(line: str):
+        stdout_tail.append(line)
+        if log_stdout:
+            log(line)
+
+    def on_stderr(line: str):
+        stderr_tail.append(line)
+        if log_stdout:
+            warn(line)
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    proc = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, **kwargs)
+
+    with proc, selectors.DefaultSelector() as selector:
+        selector.register(proc.stdout, selectors.EVENT_READ, _LineReader(on_stdout))
+        selector.register(proc.stderr, selectors.EVENT_READ, _LineReader(on_stderr))
+
+        try:
+            while selector.get_map():
+                if cancel is not None and cancel.is_set():
+                    raise ProcessCancelled(args)
+
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise subprocess.TimeoutExpired(args, timeout, '\n'.join(stdout_tail),
+                                                    '\n'.join(stderr_tail))
+
+                for key, _ in selector.select(_POLL_INTERVAL):
+                    reader: _LineReader = key.data
+                    chunk = os.read(key.fd, 65536)
+                    if chunk:
+                        reader.feed(chunk)
+                    else:
+                        reader.close()
+                        selector.unregister(key.fileobj)
+
+            returncode = proc.wait(
+                timeout=max(deadline - time.monotonic(), 0) if deadline is not None else None)
+        except BaseException:
+            _terminate(proc)
+            raise
+
+    return subprocess.CompletedProcess(args, returncode, '\n'.join(stdout_tail),
+                                       '\n'.join(stderr_tail))
+
+
+def _terminate(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=_TERMINATE_GRACE)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+class _LineReader:
+    """Splits incrementally read bytes into decoded lines."""
+
+    def __init__(self, on_line: Callable[[str], None]):
+        self._on_line = on_line
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._pending = ''
+
+    def feed(self, chunk: bytes):
+        *lines, self._pending = (self._pending + self._decoder.decode(chunk)).split('\n')
+        for line in lines:
+            self._on_line(line.rstrip('\r'))
+
+    def close(self):
+        rest = self._pending + self._decoder.decode(b'', final=True)
+        self._pending = ''
+        if rest:
+            self._on_line(rest.rstrip('\r'))
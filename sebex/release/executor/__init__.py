@@ -1,6 +1,12 @@
-from typing import List, Type
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, Future
+from threading import Lock
+from typing import List, Type, Dict, Callable, Optional
 
-from sebex.log import operation, logcontext
+from sebex.config.manifest import RepositoryHandle
+from sebex.context import Context
+from sebex.jobs import for_each, JobError, JobKind
+from sebex.log import operation, logcontext, error
 from sebex.release.executor.cleanup import Cleanup
 from sebex.release.executor.close_release_branch import CloseReleaseBranch
 from sebex.release.executor.merge_pull_request import MergePullRequest
@@ -8,6 +14,8 @@ from sebex.release.executor.open_pull_request import OpenPullRequest
 from sebex.release.executor.open_release_branch import OpenReleaseBranch
 from sebex.release.executor.publish_package import PublishPackage
 from sebex.release.executor.types import Action, Task
+from sebex.release.git import prefetch_release_pull_requests
+from sebex.release.watch import PullRequestWatcher
 from sebex.release.state import ProjectState, ReleaseState, ReleaseStage
 
 _ALL_TASK_TYPES: List[Type[Task]] = [
@@ -28,40 +36,192 @@ def get_task_by_stage(stage: ReleaseStage) -> Type[Task]:
         raise ValueError(f'Stage {stage} cannot be reached by any task.')
 
 
-def plan(release: ReleaseState) -> List[Task]:
+def plan(release: ReleaseState, pipeline: bool = False) -> List[Task]:
     def do_plan():
-        for proj in _get_current_subset(release):
+        subset = _get_ready(release) if pipeline else _get_current_subset(release)
+        for proj in subset:
             klass = get_task_by_stage(proj.stage.next)
             yield klass(project=proj)
 
     return list(do_plan())
 
 
-def proceed(release: ReleaseState) -> Action:
-    hit_breakpoint = False
+def proceed(release: ReleaseState, parallel: bool = False, pipeline: bool = False,
+            watch: bool = False) -> Action:
+    """
+    Run tasks of the current phase until each project reaches a breakpoint or finishes.
 
-    for proj in _get_current_subset(release):
-        with logcontext(str(proj.project)):
-            for next_stage in proj.stage:
-                klass = get_task_by_stage(next_stage)
-                task: Task = klass(project=proj)
+    In parallel mode, projects are processed concurrently, except projects living in the same
+    repository which share working tree and thus are processed one after another. The release
+    state is saved after each stage change, so that progress survives failures of other jobs.
 
-                with operation(task.human_name) as reporter:
-                    action = task.run(release)
-                    reporter(action.report())
+    In pipeline mode, phases are not waited for. See `_proceed_pipelined`.
 
-                    if action in (Action.PROCEED, Action.SKIP):
-                        proj.stage = next_stage
-                    elif action == Action.BREAKPOINT:
-                        hit_breakpoint = True
-                        break
-                    elif action == Action.FINISH:
-                        break
+    In watch mode, breakpoints caused by pull requests awaiting merge do not stop the execution.
+    Instead, all such pull requests are watched until any of them can be merged, and the release
+    proceeds further. Any other breakpoint, or a closed pull request, stops the execution.
+    """
 
-    if hit_breakpoint:
-        return Action.BREAKPOINT
-    else:
-        return Action.FINISH
+    watcher = PullRequestWatcher()
+
+    while True:
+        stages = [p.stage for phase in release.phases for p in phase]
+        breakpoints = _proceed(release, parallel, pipeline)
+
+        if not breakpoints:
+            progressed = stages != [p.stage for phase in release.phases for p in phase]
+            if not watch or release.is_done() or not progressed:
+                return Action.FINISH
+        elif not watch or any(p.stage != ReleaseStage.PULL_REQUEST_OPENED for p in breakpoints):
+            return Action.BREAKPOINT
+        else:
+            release.save()
+
+            if not watcher.wait(breakpoints):
+                return Action.BREAKPOINT
+
+
+def _proceed(release: ReleaseState, parallel: bool, pipeline: bool) -> List[ProjectState]:
+    """Run single round of tasks, returns projects which have hit a breakpoint."""
+
+    candidates = ([p for phase in release.phases for p in phase] if pipeline
+                  else _get_current_subset(release))
+    prefetch_release_pull_requests(p for p in candidates
+                                   if p.stage == ReleaseStage.PULL_REQUEST_OPENED)
+
+    if pipeline:
+        return _proceed_pipelined(release)
+
+    subset = candidates
+
+    if not parallel:
+        return [proj for proj in subset if _proceed_project(release, proj, _set_stage)]
+
+    lock = Lock()
+
+    def checkpoint(proj: ProjectState, stage: ReleaseStage):
+        with lock:
+            _set_stage(proj, stage)
+            release.save()
+
+    def proceed_group(group: List[ProjectState]) -> List[ProjectState]:
+        return [proj for proj in group if _proceed_project(release, proj, checkpoint)]
+
+    groups: Dict[RepositoryHandle, List[ProjectState]] = defaultdict(list)
+    for proj in subset:
+        groups[proj.project.repo].append(proj)
+
+    # Interrupting other projects halfway, e.g. while publishing, would leave them half-released
+    results = for_each(groups.values(), proceed_group, desc='Proceeding',
+                       item_desc=lambda g: str(g[0].project.repo), kind=JobKind.GIT,
+                       keep_going=True)
+    return [proj for hit in results for proj in hit]
+
+
+def _proceed_pipelined(release: ReleaseState) -> List[ProjectState]:
+    """
+    Schedule projects of all phases by their dependencies: each project is started as soon as
+    all of its direct in-release dependencies are published, and runs until it finishes or hits
+    a breakpoint. Projects of release plans which do not track dependencies fall back to waiting
+    for the whole previous phase.
+
+    Returns projects which have hit a breakpoint.
+    """
+
+    context = Context.current()
+    lock = Lock()
+
+    pending = [p for phase in release.phases for p in phase if p.stage != ReleaseStage.DONE]
+    running: Dict[Future, ProjectState] = {}
+    busy_repos = set()
+    breakpoints = []
+    failure: Optional[JobError] = None
+
+    def checkpoint(proj: ProjectState, stage: ReleaseStage):
+        with lock:
+            _set_stage(proj, stage)
+            release.save()
+
+    def run(proj: ProjectState) -> bool:
+        with Context.activate(context):
+            return _proceed_project(release, proj, checkpoint)
+
+    with ThreadPoolExecutor(max_workers=context.git_jobs) as executor:
+        while True:
+            if failure is None:
+                with lock:
+                    ready = [p for p in pending if _is_ready(release, p)]
+
+                for proj in ready:
+                    # Projects of single repository share working tree
+                    if proj.project.repo not in busy_repos:
+                        busy_repos.add(proj.project.repo)
+                        pending.remove(proj)
+                        running[executor.submit(run, proj)] = proj
+
+            if not running:
+                break
+
+            done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                proj = running.pop(future)
+                busy_repos.remove(proj.project.repo)
+
+                try:
+                    if future.result():
+                        breakpoints.append(proj)
+                except KeyboardInterrupt:
+                    raise
+                except Exception as e:
+                    job_desc = f'Proceeding: {proj.project}'
+                    error(f'Job "{job_desc}" failed!')
+                    if failure is None:
+                        failure = JobError(job_desc)
+                        failure.__cause__ = e
+
+    if failure is not None:
+        raise failure
+
+    return breakpoints
+
+
+def _is_ready(release: ReleaseState, proj: ProjectState) -> bool:
+    if proj.depends_on is None:
+        return proj in release.current_phase()
+
+    return all(release.get_project(d).stage >= ReleaseStage.PUBLISHED for d in proj.depends_on)
+
+
+def _get_ready(release: ReleaseState) -> List[ProjectState]:
+    return [p for phase in release.phases for p in phase
+            if p.stage != ReleaseStage.DONE and _is_ready(release, p)]
+
+
+def _set_stage(proj: ProjectState, stage: ReleaseStage):
+    proj.stage = stage
+
+
+def _proceed_project(release: ReleaseState, proj: ProjectState,
+                     set_stage: Callable[[ProjectState, ReleaseStage], None]) -> bool:
+    """Run tasks of single project, returns whether a breakpoint has been hit."""
+
+    with logcontext(str(proj.project)):
+        for next_stage in proj.stage:
+            klass = get_task_by_stage(next_stage)
+            task: Task = klass(project=proj)
+
+            with operation(task.human_name) as reporter:
+                action = task.run(release)
+                reporter(action.report())
+
+                if action in (Action.PROCEED, Action.SKIP):
+                    set_stage(proj, next_stage)
+                elif action == Action.BREAKPOINT:
+                    return True
+                elif action == Action.FINISH:
+                    return False
+
+    return False
 
 
 def _get_current_subset(rel: ReleaseState) -> List[ProjectState]:
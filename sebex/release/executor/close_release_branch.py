@@ -16,8 +16,9 @@ class CloseReleaseBranch(Task):
         tag = release_tag_name(self.project)
         vcs = self.project.project.repo.vcs
 
+        # Fast-forwarding over the merged release branch may reach beyond a shallow history
+        vcs.ensure_full_history()
         vcs.checkout(vcs.default_branch)
-        vcs.fetch()
         vcs.pull()
 
         vcs.delete_remote_branch(branch)
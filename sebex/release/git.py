@@ -1,8 +1,13 @@
-from typing import Optional
-
-from github.PullRequest import PullRequest
+from threading import Lock
+from typing import Optional, Dict, Tuple, Iterable
 
+from sebex.config.manifest import RepositoryHandle
+from sebex.log import operation
 from sebex.release.state import ProjectState
+from sebex.vcs import PullRequest, PullRequestState, fetch_pull_request_states
+
+_prefetched: Dict[Tuple[RepositoryHandle, str], Optional[PullRequestState]] = {}
+_prefetched_lock = Lock()
 
 
 def release_branch_name(project: ProjectState) -> str:
@@ -20,3 +25,32 @@ def pull_request_title(project: ProjectState) -> str:
 def find_release_pull_request(project: ProjectState, **filters) -> Optional[PullRequest]:
     return project.project.repo.vcs.find_pull_request(branch=release_branch_name(project),
                                                       **filters)
+
+
+def prefetch_release_pull_requests(projects: Iterable[ProjectState]):
+    """Fetch states of release pull requests of all given projects at once."""
+
+    keys = [(p.project.repo, release_branch_name(p)) for p in projects]
+    if not keys:
+        return
+
+    with operation(f'Fetching state of {len(keys)} pull requests'):
+        states = fetch_pull_request_states((repo.vcs, branch) for repo, branch in keys)
+
+    with _prefetched_lock:
+        _prefetched.update(states)
+
+
+def release_pull_request_state(project: ProjectState) -> Optional[PullRequestState]:
+    """
+    Get state of release pull request of the project. Prefetched state is used if available,
+    and it is consumed, so that subsequent calls see fresh state.
+    """
+
+    key = (project.project.repo, release_branch_name(project))
+
+    with _prefetched_lock:
+        if key in _prefetched:
+            return _prefetched.pop(key)
+
+    return fetch_pull_request_states([(key[0].vcs, key[1])])[key]
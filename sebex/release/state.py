@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from functools import total_ordering
 from textwrap import indent
-from typing import List, Iterator, Collection, Iterable, Dict, Tuple, Set
+from typing import List, Iterator, Collection, Iterable, Dict, Tuple, Set, Optional
 
 import click
 
@@ -13,7 +13,7 @@ from sebex.analysis.model import Dependency, Language, DependencyUpdate
 from sebex.analysis.version import Bump, VersionRequirement, VersionSpec, Version, UnsolvableBump
 from sebex.checksum import Checksum, Checksumable
 from sebex.config.file import ConfigFile
-from sebex.config.format import Format, YamlFormat
+from sebex.config.format import Format, YamlFormat, JsonFormat
 from sebex.config.manifest import ProjectHandle
 from sebex.edit.span import Span
 from sebex.log import operation, error, warn
@@ -92,7 +92,11 @@ class ReleaseState(ConfigFile, Checksumable):
 
     @classmethod
     def format(cls) -> Format:
-        return YamlFormat(autogenerated=True)
+        return JsonFormat()
+
+    @classmethod
+    def legacy_formats(cls) -> List[Format]:
+        return [YamlFormat(autogenerated=True)]
 
     def codename(self) -> str:
         return Checksum.of(self).petname
@@ -177,6 +181,7 @@ class ReleaseState(ConfigFile, Checksumable):
 
             rel._build_plan(db, graph)
             rel._prune_unchanged(ignore=ignore)
+            rel._link_dependencies(db, graph)
             return rel
 
     def _build_plan(self, db: AnalysisDatabase, graph: DependentsGraph):
@@ -257,16 +262,10 @@ class ReleaseState(ConfigFile, Checksumable):
             for project in phase:
                 project_pkg = db.about(project.project).package
 
-                # Now for each project, get its dependents along with relations...
-                for dependency_pkg, relations in graph.dependents_of(project_pkg).items():
-                    dependency = db.get_project_by_package(dependency_pkg)
-
-                    # ...and find the dependency relation that connects these two directly.
-                    # There should be only one relation in the list, this condition works as an
-                    # assertion.
-                    relation = next(c for c in relations if c.name == project_pkg)
-
-                    yield project, dependency, relation
+                # Now for each project, get its dependents along with relations
+                # connecting these two directly
+                for dependency_pkg, relation in graph.relations_of(project_pkg).items():
+                    yield project, db.get_project_by_package(dependency_pkg), relation
 
     def _prune_unchanged(self, ignore: Set[ProjectHandle] = None):
         """Drop no-op phases."""
@@ -282,6 +281,17 @@ class ReleaseState(ConfigFile, Checksumable):
         )
         self.phases = [phase for phase in pruned_phases if phase]
 
+    def _link_dependencies(self, db: AnalysisDatabase, graph: DependentsGraph):
+        """Record direct dependencies of each project, which are also part of this release."""
+
+        in_release = {project.project for phase in self.phases for project in phase}
+
+        for phase in self.phases:
+            for project in phase:
+                dependencies = (db.get_project_by_package(pkg)
+                                for pkg in graph.dependencies_of(db.about(project.project).package))
+                project.depends_on = [d for d in dependencies if d in in_release]
+
     @classmethod
     def _is_project_noop(cls, project: 'ProjectState') -> bool:
         if project.from_version == project.to_version:
@@ -377,6 +387,8 @@ class ProjectState(Checksumable):
     publish: bool = False
     dependency_updates: List[DependencyUpdate] = field(default_factory=list)
     stage: ReleaseStage = ReleaseStage.CLEAN
+    # Unknown for release plans made before dependencies were tracked
+    depends_on: Optional[List[ProjectHandle]] = None
 
     @property
     def bump(self) -> Bump:
@@ -451,6 +463,9 @@ class ProjectState(Checksumable):
         if self.dependency_updates:
             d['dependency_updates'] = [d.to_raw() for d in self.dependency_updates]
 
+        if self.depends_on is not None:
+            d['depends_on'] = [str(p) for p in self.depends_on]
+
         return d
 
     @classmethod
@@ -465,6 +480,8 @@ class ProjectState(Checksumable):
             dependency_updates=[DependencyUpdate.from_raw(d)
                                 for d in o.get('dependency_updates', [])],
             stage=ReleaseStage(o['stage']),
+            depends_on=([ProjectHandle.parse(p) for p in o['depends_on']]
+                        if 'depends_on' in o else None),
         )
 
 
@@ -0,0 +1,157 @@
+import time
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Dict, Tuple, List, Optional
+
+from sebex.context import Context
+from sebex.jobs import for_each, JobKind
+from sebex.log import operation, log, error
+from sebex.release.git import find_release_pull_request
+from sebex.release.state import ProjectState
+from sebex.vcs import PullRequest, PullRequestState
+
+MIN_POLL_INTERVAL = 10
+MAX_POLL_INTERVAL = 300
+
+
+class Readiness(Enum):
+    WAITING = auto()
+    BLOCKED = auto()
+    READY = auto()
+    MERGED = auto()
+    CLOSED = auto()
+
+    @property
+    def is_final(self) -> bool:
+        """Whether the release executor has something to do with the pull request."""
+        return self in (self.READY, self.MERGED, self.CLOSED)
+
+
+@dataclass(frozen=True)
+class MergeStatus:
+    readiness: Readiness
+    reason: Optional[str] = None
+
+    @classmethod
+    def evaluate(cls, pr: PullRequestState) -> 'MergeStatus':
+        """
+        Decide whether pull request can be merged.
+
+        >>> MergeStatus.evaluate(PullRequestState(number=1, url='', state='open', merged=False,
+        ...                                       mergeable=True, status='success'))
+        MergeStatus(readiness=<Readiness.READY: 3>, reason=None)
+        """
+
+        if pr.merged:
+            return cls(Readiness.MERGED)
+
+        if pr.state == 'closed':
+            return cls(Readiness.CLOSED, 'closed without merging')
+
+        # GitHub computes mergeability in background, null means it is not known yet
+        if pr.mergeable is None:
+            return cls(Readiness.WAITING, 'mergeability is being computed')
+
+        if not pr.mergeable:
+            return cls(Readiness.BLOCKED, 'not mergeable')
+
+        if pr.status in ('failure', 'error'):
+            failed = ', '.join(c for c, s in pr.statuses if s in ('failure', 'error'))
+            return cls(Readiness.BLOCKED, f'failed statuses: {failed}')
+        elif pr.status == 'pending' and pr.statuses:
+            pending = ', '.join(c for c, s in pr.statuses if s == 'pending')
+            return cls(Readiness.WAITING, f'waiting for statuses: {pending}')
+
+        # Only the latest review of each user counts
+        changes_requested = {user: state == 'CHANGES_REQUESTED' for user, state in pr.reviews}
+        if any(changes_requested.values()):
+            users = ', '.join(u for u, s in changes_requested.items() if s)
+            return cls(Readiness.BLOCKED, f'changes requested by: {users}')
+
+        return cls(Readiness.READY)
+
+
+class PullRequestWatcher:
+    """
+    Polls release pull requests of many projects at once, until any of them needs attention
+    of the release executor. The polling interval grows exponentially while nothing changes,
+    and is reset as soon as any of the watched resources changes.
+
+    The watcher remembers last seen status of each pull request, so that a pull request which
+    has been left unmerged by the executor (e.g. the user declined merging) is not reported again.
+    Failed polls are reported and retried on the next tick, keeping the last seen status.
+    """
+
+    def __init__(self):
+        self._pulls: Dict[str, PullRequest] = {}
+        self._statuses: Dict[str, MergeStatus] = {}
+
+    def wait(self, projects: List[ProjectState]) -> bool:
+        """
+        Block until any pull request becomes ready to merge or is merged.
+        Returns `False` if any pull request has been closed and cannot be waited for, or if none
+        of them can progress without user intervention (e.g. merging all of them was declined).
+        """
+
+        with operation(f'Watching {len(projects)} pull requests'):
+            interval = MIN_POLL_INTERVAL
+
+            while True:
+                polled = for_each(projects, self._try_poll, desc='Polling pull request',
+                                  kind=JobKind.NETWORK,
+                                  item_desc=lambda p: str(p.project))
+                results = [r for r in polled if r is not None]
+
+                if any(s.readiness == Readiness.CLOSED for _, s, _ in results):
+                    return False
+
+                if any(s.readiness.is_final and s != prev for prev, s, _ in results):
+                    return True
+
+                # Pull requests left unmerged by the executor do not change state on their own
+                if len(results) == len(polled) and \
+                        all(s.readiness.is_final for _, s, _ in results):
+                    return False
+
+                if any(changed for _, _, changed in results):
+                    interval = MIN_POLL_INTERVAL
+                else:
+                    interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+                time.sleep(interval)
+
+    def _try_poll(
+        self, project: ProjectState
+    ) -> Optional[Tuple[Optional[MergeStatus], MergeStatus, bool]]:
+        try:
+            return self._poll(project)
+        except AssertionError:
+            raise
+        except Exception as e:
+            error(f'{project.project}: failed to poll pull request, retrying later:', e)
+            return None
+
+    def _poll(self, project: ProjectState) -> Tuple[Optional[MergeStatus], MergeStatus, bool]:
+        key = str(project.project)
+        pr = self._pulls.get(key)
+        if pr is None:
+            pr = self._pulls[key] = find_release_pull_request(project, state='all')
+            if pr is None:
+                raise AssertionError('At this stage, the pull request should already exist.')
+
+        # Conditional requests of unchanged resources do not count against the rate limit
+        github = Context.current().github_api
+        raw_pr, pr_changed = github.get(pr.url)
+        raw_status, status_changed = github.get(
+            f'{raw_pr["base"]["repo"]["url"]}/commits/{raw_pr["head"]["sha"]}/status')
+        raw_reviews, reviews_changed = github.get_all(f'{pr.url}/reviews?per_page=100')
+
+        previous = self._statuses.get(key)
+        status = MergeStatus.evaluate(PullRequestState.from_rest(raw_pr, raw_status, raw_reviews))
+        if previous != status:
+            self._statuses[key] = status
+            report = error if status.readiness == Readiness.CLOSED else log
+            report(f'{project.project}: pull request #{raw_pr["number"]}',
+                   status.readiness.name.lower(), *([status.reason] if status.reason else []))
+
+        return previous, status, pr_changed or status_changed or reviews_changed
@@ -2,14 +2,14 @@ import re
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple, Iterable, Set
+from urllib.parse import urlencode
 
 import click
 from git import Head, Repo as GitRepo, GitCommandError
-from github import Repository as GithubRepository
-from github.PullRequest import PullRequest
 
 from sebex.cli import confirm
+from sebex.config.clone import CloneSettings
 from sebex.config.manifest import RepositoryHandle, Manifest
 from sebex.context import Context
 from sebex.log import log, operation, fatal, warn
@@ -40,17 +40,17 @@ class Vcs:
         return GitRepo(self.location)
 
     @cached_property
-    def github(self) -> GithubRepository:
-        manifest = Manifest.open().get_repository_by_name(self.repo)
+    def github_full_name(self) -> str:
+        manifest = Manifest.current().get_repository_by_name(self.repo)
         m = _GITHUB_SSH_URL.match(manifest.remote_url)
         if m:
-            return Context.current().github.get_repo(m['full'], lazy=True)
+            return m['full']
         else:
             raise ValueError('Repository is not hosted on GitHub')
 
     @cached_property
     def default_branch(self) -> str:
-        manifest = Manifest.open().get_repository_by_name(self.repo)
+        manifest = Manifest.current().get_repository_by_name(self.repo)
         return manifest.default_branch
 
     @property
@@ -61,28 +61,109 @@ class Vcs:
     def default_remote(self) -> str:
         return self.git.remote().name
 
+    @property
+    def is_shallow(self) -> bool:
+        return (Path(self.git.git_dir) / 'shallow').exists()
+
     def is_dirty(self) -> bool:
         return self.git.is_dirty()
 
+    def status(self) -> 'RepositoryStatus':
+        """Current branch, its divergence from upstream and working tree changes at once."""
+        return RepositoryStatus.parse(self.git.git.status('--porcelain=v2', '--branch'))
+
+    @cached_property
+    def _tracked_paths(self) -> Set[str]:
+        return set(p for p in self.git.git.ls_files('-z').split('\0') if p)
+
+    @cached_property
+    def _branches(self) -> Set[str]:
+        return set(h.name for h in self.git.heads)
+
+    def _invalidate(self):
+        """Drop snapshots of index and branches, after changing them."""
+        self.__dict__.pop('_tracked_paths', None)
+        self.__dict__.pop('_branches', None)
+
+    def _relative(self, file: Path) -> Optional[str]:
+        """Path of the file relative to repository root, as used by Git, or `None` if outside."""
+        try:
+            return file.resolve().relative_to(self.location.resolve()).as_posix()
+        except ValueError:
+            return None
+
     def is_tracked(self, file: Path) -> bool:
-        return file.resolve() in ((self.location / line).resolve()
-                                  for line in self.git.git.ls_files().split('\n'))
+        return self._relative(file) in self._tracked_paths
 
     def is_changed(self, file: Path) -> bool:
-        return file.resolve() in ((self.location / item.a_path).resolve()
-                                  for item in self.git.index.diff(None))
+        """
+        Whether the file has unstaged changes. Only this file is diffed, and the answer is never
+        cached, unlike tracked paths, because the working tree is also changed by external tools
+        (e.g. `mix deps.update`), which would leave any snapshot of it silently stale.
+        """
+
+        path = self._relative(file)
+        return path is not None and bool(self.git.git.diff('--name-only', '--', path))
 
     def branch_exists(self, branch: str) -> bool:
-        return branch in (h.name for h in self.git.heads)
+        return branch in self._branches
+
+    @property
+    def is_fetched(self) -> bool:
+        """Whether the repository has already been fetched during this run."""
+        return self.location in Context.current().fetched_repositories
+
+    def mark_stale(self):
+        """Make next fetch hit the remote, e.g. because it has been changed through GitHub."""
+        Context.current().fetched_repositories.discard(self.location)
+
+    def fetch(self, all_remotes: bool = False):
+        """
+        Fetch all branches and tags in single round trip. Repeated fetches during one run are
+        skipped, unless the repository has been marked stale.
+
+        With `all_remotes`, all remotes and submodules are fetched, in parallel.
+        """
 
-    def fetch(self):
-        with operation('Fetching', self.repo):
-            self.git.remote().fetch(refspec='refs/heads/*:refs/remotes/origin/*')
-            self.git.remote().fetch(refspec='refs/tags/*:refs/tags/*')
+        with operation('Fetching', self.repo) as reporter:
+            if self.is_fetched and not all_remotes:
+                reporter(_SKIP)
+                return
+
+            # Keep shallow clones shallow, otherwise full history of fetched refs would be pulled
+            depth = CloneSettings.open().depth if self.is_shallow else None
+            options = {'depth': depth} if depth else {}
+
+            if all_remotes:
+                self.git.git.fetch('--all', '--tags', '--recurse-submodules=on-demand',
+                                   f'--jobs={Context.current().git_jobs}',
+                                   *([f'--depth={depth}'] if depth else []))
+            else:
+                self.git.remote().fetch(refspec=['refs/heads/*:refs/remotes/origin/*',
+                                                 'refs/tags/*:refs/tags/*'], **options)
+
+        Context.current().fetched_repositories.add(self.location)
+
+    def unshallow(self):
+        with operation('Fetching full history of', self.repo):
+            self.git.remote().fetch(unshallow=True)
+
+        Context.current().fetched_repositories.add(self.location)
+
+    def ensure_full_history(self):
+        """Unshallow the clone, if it is shallow. For operations which need to walk history."""
+
+        if self.is_shallow:
+            self.unshallow()
 
     def pull(self):
+        """Fetch if needed, and fast-forward current branch to its upstream."""
+
+        self.fetch()
+
         with operation('Pulling', self.repo):
-            self.git.remote().pull()
+            self.git.git.merge('--ff-only', '@{upstream}')
+            self._invalidate()
 
     def commit(self, base_message: str, files: List[Path] = None):
         log('Commit:', click.style(base_message, fg='magenta'))
@@ -93,6 +174,7 @@ class Vcs:
             self.git.git.add('.')
 
         self.git.git.commit('-m', base_message)
+        self._invalidate()
 
     def tag(self, tag: str, message=None):
         self.git.create_tag(tag, message=message)
@@ -114,6 +196,7 @@ class Vcs:
 
                     warn('Deleting existing branch', branch)
                     Head.delete(self.git, branch, force=True)
+                    self._invalidate()
 
             # Verify that we are in clean state
             if ensure_clean and self.is_dirty():
@@ -125,6 +208,8 @@ class Vcs:
             else:
                 self.git.git.checkout('-b', branch)
 
+            self._invalidate()
+
     def push(self, branch: str = None, tag: str = None):
         def do_push(*args):
             try:
@@ -147,6 +232,7 @@ class Vcs:
         with operation(f'Deleting local branch {branch}') as reporter:
             if self.branch_exists(branch):
                 Head.delete(self.git, branch)
+                self._invalidate()
             else:
                 reporter(_SKIP)
 
@@ -160,13 +246,16 @@ class Vcs:
                 else:
                     raise
 
-    def find_pull_request(self, branch: str, **filters) -> Optional[PullRequest]:
-        pulls = self.github.get_pulls(
-            base=self.default_branch,
-            head=f'{self.github.owner.login}:{branch}',
+    def find_pull_request(self, branch: str, **filters) -> Optional['PullRequest']:
+        owner = self.github_full_name.split('/', maxsplit=1)[0]
+        query = urlencode({
+            'base': self.default_branch,
+            'head': f'{owner}:{branch}',
             **{'state': 'open', 'sort': 'created', 'direction': 'desc', **filters},
-        )
-        return next(iter(pulls), None)
+        })
+        pulls, _ = Context.current().github_api.get(
+            f'repos/{self.github_full_name}/pulls?{query}')
+        return PullRequest.from_rest(pulls[0]) if pulls else None
 
     def open_pull_request(self, title: str, body: str, branch: str = None, base: str = None,
                           push: bool = True) -> bool:
@@ -187,7 +276,187 @@ class Vcs:
         body = body + _PR_MARKETING
         body = body.strip()
 
-        pr = self.github.create_pull(title=title, head=branch, base=base, body=body)
+        pr = PullRequest.from_rest(Context.current().github_api.post(
+            f'repos/{self.github_full_name}/pulls',
+            {'title': title, 'head': branch, 'base': base, 'body': body}))
 
         log('Pull request opened:', pr.html_url)
         return True
+
+    def merge_pull_request(self, number: int) -> Tuple[bool, str]:
+        """Merge pull request, returns whether it has been merged along with GitHub's message."""
+
+        result = Context.current().github_api.put(
+            f'repos/{self.github_full_name}/pulls/{number}/merge')
+        return result['merged'], result.get('message', '')
+
+
+@dataclass(frozen=True)
+class PullRequest:
+    """Reference to pull request, as returned by GitHub REST API."""
+
+    number: int
+    url: str
+    html_url: str
+
+    @classmethod
+    def from_rest(cls, pr: Dict) -> 'PullRequest':
+        return cls(number=pr['number'], url=pr['url'], html_url=pr['html_url'])
+
+
+@dataclass(frozen=True)
+class RepositoryStatus:
+    branch: Optional[str]
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    changed: int = 0
+    untracked: int = 0
+    conflicts: int = 0
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.changed or self.untracked or self.conflicts)
+
+    @classmethod
+    def parse(cls, porcelain: str) -> 'RepositoryStatus':
+        """
+        Parse output of `git status --porcelain=v2 --branch`.
+
+        >>> RepositoryStatus.parse('''# branch.oid 0123abcd
+        ... # branch.head master
+        ... # branch.upstream origin/master
+        ... # branch.ab +1 -2
+        ... 1 .M N... 100644 100644 100644 0123 0123 mix.exs
+        ... ? notes.txt''')
+        RepositoryStatus(branch='master', upstream='origin/master', ahead=1, behind=2, \
+changed=1, untracked=1, conflicts=0)
+        """
+
+        branch = upstream = None
+        ahead = behind = changed = untracked = conflicts = 0
+
+        for line in porcelain.splitlines():
+            kind, _, rest = line.partition(' ')
+            if kind == '#':
+                key, _, value = rest.partition(' ')
+                if key == 'branch.head':
+                    branch = value if value != '(detached)' else None
+                elif key == 'branch.upstream':
+                    upstream = value
+                elif key == 'branch.ab':
+                    a, b = value.split(' ')
+                    ahead, behind = int(a), -int(b)
+            elif kind in ('1', '2'):
+                changed += 1
+            elif kind == 'u':
+                conflicts += 1
+            elif kind == '?':
+                untracked += 1
+
+        return cls(branch=branch, upstream=upstream, ahead=ahead, behind=behind, changed=changed,
+                   untracked=untracked, conflicts=conflicts)
+
+
+@dataclass(frozen=True)
+class PullRequestState:
+    """
+    A snapshot of pull request state, along with status checks of its head commit and reviews.
+    Values follow the conventions of GitHub REST API, i.e. are lowercase.
+    """
+
+    number: int
+    url: str
+    state: str
+    merged: bool
+    mergeable: Optional[bool]
+    status: Optional[str] = None
+    statuses: Tuple[Tuple[str, str], ...] = ()
+    reviews: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_rest(cls, pr: Dict, status: Dict, reviews: List[Dict]) -> 'PullRequestState':
+        return cls(
+            number=pr['number'],
+            url=pr['html_url'],
+            state=pr['state'],
+            merged=pr.get('merged', False),
+            mergeable=pr.get('mergeable'),
+            status=status['state'] if status.get('statuses') else None,
+            statuses=tuple((s['context'], s['state']) for s in status.get('statuses', [])),
+            reviews=tuple((r['user']['login'], r['state']) for r in reviews if r.get('user')),
+        )
+
+    @classmethod
+    def from_graphql(cls, node: Dict) -> 'PullRequestState':
+        commits = node['commits']['nodes']
+        status = commits[0]['commit']['status'] if commits else None
+
+        return cls(
+            number=node['number'],
+            url=node['url'],
+            state='open' if node['state'] == 'OPEN' else 'closed',
+            merged=node['merged'],
+            mergeable={'MERGEABLE': True, 'CONFLICTING': False}.get(node['mergeable']),
+            status=status['state'].lower() if status else None,
+            statuses=tuple((c['context'], c['state'].lower())
+                           for c in (status['contexts'] if status else [])),
+            reviews=tuple((r['author']['login'], r['state'])
+                          for r in node['reviews']['nodes'] if r.get('author')),
+        )
+
+
+_PULL_REQUEST_FRAGMENT = '''
+pullRequests(headRefName: $head%(i)d, baseRefName: $base%(i)d, first: 10,
+             orderBy: {field: CREATED_AT, direction: DESC}) {
+  nodes {
+    number url state merged mergeable
+    headRepositoryOwner { login }
+    commits(last: 1) { nodes { commit { status { state contexts { context state } } } } }
+    reviews(last: 100) { nodes { author { login } state } }
+  }
+}
+'''
+
+# Keep queries well below GitHub limits of query complexity
+_GRAPHQL_BATCH_SIZE = 50
+
+
+def fetch_pull_request_states(
+    pulls: Iterable[Tuple[Vcs, str]]
+) -> Dict[Tuple[RepositoryHandle, str], Optional[PullRequestState]]:
+    """
+    Fetch the newest pull request of each given repository and head branch, targeting
+    the default branch of the repository, using as few GraphQL queries as possible.
+    Missing pull requests are mapped to `None`.
+    """
+
+    pulls = list(pulls)
+    result = {}
+
+    for start in range(0, len(pulls), _GRAPHQL_BATCH_SIZE):
+        batch = pulls[start:start + _GRAPHQL_BATCH_SIZE]
+
+        params = []
+        fields = []
+        variables = {}
+        for i, (vcs, branch) in enumerate(batch):
+            owner, name = vcs.github_full_name.split('/', maxsplit=1)
+            params.append(f'$owner{i}: String!, $name{i}: String!, '
+                          f'$head{i}: String!, $base{i}: String!')
+            fields.append(f'r{i}: repository(owner: $owner{i}, name: $name{i}) '
+                          f'{{ {_PULL_REQUEST_FRAGMENT % {"i": i}} }}')
+            variables.update({f'owner{i}': owner, f'name{i}': name,
+                              f'head{i}': branch, f'base{i}': vcs.default_branch})
+
+        query = f'query({", ".join(params)}) {{ {" ".join(fields)} }}'
+        data = Context.current().github_api.graphql(query, variables)
+
+        for i, (vcs, branch) in enumerate(batch):
+            owner = vcs.github_full_name.split('/', maxsplit=1)[0]
+            nodes = [n for n in data[f'r{i}']['pullRequests']['nodes']
+                     if (n.get('headRepositoryOwner') or {}).get('login') == owner]
+            result[(vcs.repo, branch)] = PullRequestState.from_graphql(nodes[0]) if nodes else None
+
+    return result
+
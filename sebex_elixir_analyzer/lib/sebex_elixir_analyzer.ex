@@ -4,13 +4,20 @@ defmodule Sebex.ElixirAnalyzer do
   alias Sebex.ElixirAnalyzer.MixLoader
   alias Sebex.ElixirAnalyzer.SourceAnalysis
 
-  @spec analyze_mix_exs_file!(path :: Path.t()) :: AnalysisReport.t() | no_return
-  def analyze_mix_exs_file!(path) do
-    File.read!(path) |> analyze_mix_exs_source!()
+  @typedoc """
+  Analysis options:
+  - `hex` - whether to fetch package information from Hex, defaults to `true`
+  """
+  @type opts :: [hex: boolean]
+
+  @spec analyze_mix_exs_file!(path :: Path.t(), opts :: opts) :: AnalysisReport.t() | no_return
+  def analyze_mix_exs_file!(path, opts \\ []) do
+    File.read!(path) |> analyze_mix_exs_source!(opts)
   end
 
-  @spec analyze_mix_exs_source!(mix_exs_source :: String.t()) :: AnalysisReport.t() | no_return
-  def analyze_mix_exs_source!(mix_exs_source) do
+  @spec analyze_mix_exs_source!(mix_exs_source :: String.t(), opts :: opts) ::
+          AnalysisReport.t() | no_return
+  def analyze_mix_exs_source!(mix_exs_source, opts \\ []) do
     project_info = MixLoader.from_source!(mix_exs_source)
 
     package_name =
@@ -38,7 +45,7 @@ defmodule Sebex.ElixirAnalyzer do
       """
     end
 
-    hex = HexInfo.fetch!(package_name)
+    hex = if Keyword.get(opts, :hex, true), do: HexInfo.fetch!(package_name), else: nil
 
     %AnalysisReport{
       package: package_name,
@@ -8,7 +8,7 @@ defmodule Sebex.ElixirAnalyzer.AnalysisReport do
           version: String.t(),
           version_span: Span.t(),
           dependencies: list(Dependency.t()),
-          hex: HexInfo.t()
+          hex: HexInfo.t() | nil
         }
 
   @derive Jason.Encoder
@@ -1,13 +1,100 @@
 defmodule Sebex.ElixirAnalyzer.CLI do
-  def main(["--mix", path]) do
+  alias Sebex.ElixirAnalyzer
+
+  # Evaluated mix.exs files are free to print to standard output too, so server replies
+  # start on a fresh line and are prefixed with a marker which cannot be confused with them
+  @reply_marker "\x1Esebex:"
+
+  def main(args) do
+    {analysis_opts, args} = extract_analysis_opts(args)
+    run(args, analysis_opts)
+  end
+
+  defp run(["--mix", path], analysis_opts) do
     path
-    |> Sebex.ElixirAnalyzer.analyze_mix_exs_file!()
+    |> ElixirAnalyzer.analyze_mix_exs_file!(analysis_opts)
     |> Jason.encode!()
     |> IO.puts()
   end
 
-  def main(_args) do
-    IO.puts("usage: sebex_elixir_analyzer --mix PATH_TO_MIX_EXS")
+  defp run(["--batch"], analysis_opts) do
+    IO.stream(:stdio, :line)
+    |> Stream.map(&String.trim/1)
+    |> Stream.reject(&(&1 == ""))
+    |> analyze_batch(analysis_opts)
+  end
+
+  defp run(["--batch" | paths], analysis_opts) do
+    analyze_batch(paths, analysis_opts)
+  end
+
+  defp run(["--server"], analysis_opts) do
+    IO.stream(:stdio, :line)
+    |> Stream.map(&String.trim/1)
+    |> Stream.reject(&(&1 == ""))
+    |> Enum.each(fn line ->
+      json =
+        line
+        |> serve_request(analysis_opts)
+        |> Jason.encode!()
+
+      IO.puts(["\n", @reply_marker, json])
+    end)
+  end
+
+  defp run(_args, _analysis_opts) do
+    IO.puts("""
+    usage: sebex_elixir_analyzer [--no-hex] --mix PATH_TO_MIX_EXS
+           sebex_elixir_analyzer [--no-hex] --batch [PATH_TO_MIX_EXS...]
+           sebex_elixir_analyzer [--no-hex] --server
+
+    With --no-hex, package information is not fetched from Hex and reports have null `hex` field.
+
+    In batch mode, paths are read from standard input (one per line) if none are given,
+    and one JSON object is printed per line for each path, in order.
+
+    In server mode, JSON requests of form {"id": ID, "mix": PATH} are read from standard
+    input (one per line), and each is answered with a single line JSON response carrying
+    the same ID, until standard input is closed. Response lines are prefixed with the
+    "\\x1Esebex:" marker, to be told apart from output of evaluated mix.exs files.
+    """)
+
     System.stop(1)
   end
+
+  @spec extract_analysis_opts(args :: [String.t()]) :: {ElixirAnalyzer.opts(), [String.t()]}
+  defp extract_analysis_opts(args) do
+    {[hex: "--no-hex" not in args], List.delete(args, "--no-hex")}
+  end
+
+  @spec analyze_batch(paths :: Enumerable.t(), analysis_opts :: ElixirAnalyzer.opts()) :: :ok
+  defp analyze_batch(paths, analysis_opts) do
+    Enum.each(paths, fn path ->
+      path
+      |> batch_entry(analysis_opts)
+      |> Jason.encode!()
+      |> IO.puts()
+    end)
+  end
+
+  @spec serve_request(line :: String.t(), analysis_opts :: ElixirAnalyzer.opts()) :: map
+  def serve_request(line, analysis_opts \\ []) do
+    case Jason.decode(line) do
+      {:ok, %{"id" => id, "mix" => path}} when is_binary(path) ->
+        path |> batch_entry(analysis_opts) |> Map.put(:id, id)
+
+      {:ok, %{"id" => id}} ->
+        %{id: id, error: "invalid request"}
+
+      _ ->
+        %{error: "invalid request"}
+    end
+  end
+
+  @spec batch_entry(path :: Path.t(), analysis_opts :: ElixirAnalyzer.opts()) :: map
+  def batch_entry(path, analysis_opts \\ []) do
+    %{path: path, report: ElixirAnalyzer.analyze_mix_exs_file!(path, analysis_opts)}
+  rescue
+    e -> %{path: path, error: Exception.message(e)}
+  end
 end
@@ -5,6 +5,10 @@ defmodule Sebex.ElixirAnalyzer.MixLoader do
 
     project_info = apply(module, :project, [])
 
+    # `use Mix.Project` pushes the project onto Mix project stack, pop it so that other
+    # projects (possibly with the same module name) can be loaded within this VM.
+    Mix.Project.pop()
+
     :code.delete(module)
     :code.purge(module)
 
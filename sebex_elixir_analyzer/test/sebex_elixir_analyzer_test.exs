@@ -298,4 +298,29 @@ defmodule Sebex.ElixirAnalyzerTest do
                ])
            }
   end
+
+  test "batch entry reports analysis errors instead of raising" do
+    assert %{path: "does/not/exist/mix.exs", error: error} =
+             Sebex.ElixirAnalyzer.CLI.batch_entry("does/not/exist/mix.exs")
+
+    assert is_binary(error)
+  end
+
+  test "server answers requests with matching ids" do
+    assert %{id: 7, path: "does/not/exist/mix.exs", error: _} =
+             Sebex.ElixirAnalyzer.CLI.serve_request(~S({"id": 7, "mix": "does/not/exist/mix.exs"}))
+
+    assert %{id: 8, error: "invalid request"} =
+             Sebex.ElixirAnalyzer.CLI.serve_request(~S({"id": 8}))
+
+    assert %{error: "invalid request"} = Sebex.ElixirAnalyzer.CLI.serve_request("garbage")
+  end
+
+  test "skips Hex lookup when asked to" do
+    report = Sebex.ElixirAnalyzer.analyze_mix_exs_source!(@ecto_mix_exs, hex: false)
+
+    assert report.package == "ecto"
+    assert report.hex == nil
+    assert_not_called(:hex_api_package.get(:_, :_))
+  end
 end
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import Dict, Optional, Callable
+from typing import Dict, Optional, Callable, Iterable
 
 from sebex.analysis.database import _Projects, AnalysisDatabase
 from sebex.analysis.model import Dependency, Language, AnalysisEntry
@@ -10,8 +10,9 @@ from sebex.edit.span import Span
 
 class MockAnalysisDatabase(AnalysisDatabase):
     @classmethod
-    def mock(cls, projects: _Projects) -> 'MockAnalysisDatabase':
-        return cls._analyze(projects)
+    def mock(cls, projects: _Projects,
+             changed: Optional[Iterable[ProjectHandle]] = None) -> 'MockAnalysisDatabase':
+        return cls._analyze(projects, changed)
 
 
 def _prepare_versions(versions: Optional[Dict[str, str]] = None) -> Dict[str, Version]:
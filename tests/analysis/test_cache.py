@@ -0,0 +1,31 @@
+from sebex.analysis.cache import AnalysisCache
+from sebex.analysis.model import Language
+from sebex.checksum import Checksum
+from sebex.config.manifest import ProjectHandle
+from tests.analysis.mock_database import stupid_db
+
+
+def test_hit_and_miss():
+    db = stupid_db()
+    project = ProjectHandle.parse('b')
+    cache = AnalysisCache(name=None, data=None)
+
+    assert cache.get(project, Checksum.of('v1')) is None
+
+    cache.put(project, Checksum.of('v1'), Language.ELIXIR, db.about(project))
+    assert cache.get(project, Checksum.of('v1')) == (Language.ELIXIR, db.about(project))
+    assert cache.get(project, Checksum.of('v2')) is None
+    assert cache.get(ProjectHandle.parse('c'), Checksum.of('v1')) is None
+
+
+def test_evict():
+    db = stupid_db()
+    cache = AnalysisCache(name=None, data=None)
+    for project in db.projects():
+        cache.put(project, Checksum.of(str(project)), Language.ELIXIR, db.about(project))
+
+    assert cache.evict([ProjectHandle.parse('a'), ProjectHandle.parse('e:unused')]) == 5
+
+    assert cache.get(ProjectHandle.parse('a'), Checksum.of('a')) is not None
+    assert cache.get(ProjectHandle.parse('e:unused'), Checksum.of('e:unused')) is not None
+    assert cache.get(ProjectHandle.parse('b'), Checksum.of('b')) is None
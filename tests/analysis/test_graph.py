@@ -1,3 +1,5 @@
+from typing import List, Dict, Optional
+
 import pytest
 
 from sebex.analysis.graph import DependentsGraph
@@ -70,6 +72,50 @@ def test_build_detects_cycles():
         DependentsGraph.build(db)
 
 
+def _cyclic_db(edges: Dict[str, List[str]],
+               changed: Optional[List[str]] = None) -> MockAnalysisDatabase:
+    if changed is not None:
+        changed = [ProjectHandle.parse(pkg) for pkg in changed]
+
+    return MockAnalysisDatabase.mock({
+        ProjectHandle.parse(pkg): (Language.ELIXIR, AnalysisEntry(
+            package=pkg,
+            version=Version(1, 0, 0),
+            version_span=Span.ZERO,
+            dependencies=[
+                Dependency(
+                    name=dep,
+                    defined_in=pkg,
+                    version_spec=VersionSpec(VersionRequirement.parse('~> 1.0')),
+                    version_spec_span=Span.ZERO
+                )
+                for dep in deps
+            ]
+        ))
+        for pkg, deps in edges.items()
+    }, changed)
+
+
+def test_build_reports_all_cycles():
+    db = _cyclic_db({
+        'a': ['b'],
+        'b': ['c', 'x'],
+        'c': ['a'],
+        'd': ['a'],
+        'x': ['y'],
+        'y': ['x', 'z'],
+        'z': [],
+    })
+
+    with pytest.raises(ValueError, match='2 cycles .*: a->b->c->a, x->y->x'):
+        DependentsGraph.build(db)
+
+
+def test_build_deep_chain():
+    db = _cyclic_db({f'p{i}': [f'p{i + 1}'] if i < 5000 else [] for i in range(5001)})
+    assert len(DependentsGraph.build(db)) == 5001
+
+
 def test_dependents_of():
     graph = DependentsGraph.build(stupid_db())
     assert graph.dependents_of('a') == {
@@ -109,3 +155,85 @@ def test_upgrade_phases():
     assert graph.upgrade_phases('b') == [{'b'}, {'c', 'd'}]
     assert graph.upgrade_phases('f') == [{'f'}, {'b', 'g'}, {'c', 'd'}]
     assert graph.upgrade_phases('a') == [{'a'}, {'f'}, {'b', 'g'}, {'c', 'd'}]
+
+
+def _layered_graph(height: int, width: int) -> DependentsGraph:
+    """Each package in layer `h` is a dependency of every package in layer `h + 1`."""
+
+    def layer(h: int) -> List[str]:
+        return ['root'] if h == 0 else [f'{h}-{w}' for w in range(width)]
+
+    graph = {}
+    for h in range(height):
+        for pkg in layer(h):
+            graph[pkg] = {
+                dependent: Dependency(
+                    name=pkg,
+                    defined_in=dependent,
+                    version_spec=VersionSpec(VersionRequirement.parse('~> 1.0')),
+                    version_spec_span=Span.ZERO
+                )
+                for dependent in (layer(h + 1) if h + 1 < height else [])
+            }
+
+    return DependentsGraph(graph)
+
+
+def test_upgrade_phases_diamonds():
+    graph = _layered_graph(height=40, width=3)
+    phases = graph.upgrade_phases('root')
+
+    assert len(phases) == 40
+    assert phases[0] == {'root'}
+    assert phases[-1] == {'39-0', '39-1', '39-2'}
+
+
+def test_upgrade_phases_deep_chain():
+    graph = _layered_graph(height=5000, width=1)
+    phases = graph.upgrade_phases('root')
+
+    assert len(phases) == 5000
+    assert phases[4999] == {'4999-0'}
+
+
+def test_adjacency_indexes():
+    graph = DependentsGraph.build(stupid_db())
+
+    assert graph.dependencies_of('c') == ('a', 'b')
+    assert graph.dependencies_of('a') == ()
+    assert set(graph.relations_of('b').keys()) == {'c', 'd'}
+    assert graph.relation('b', 'd') == Dependency(
+        name='b',
+        defined_in='d',
+        version_spec=VersionSpec(VersionRequirement.parse('~> 1.0')),
+        version_spec_span=Span.ZERO
+    )
+
+    with pytest.raises(TypeError):
+        graph.relations_of('b')['x'] = graph.relation('b', 'd')
+
+
+def test_patch_reuses_unchanged_edges():
+    graph = DependentsGraph.build(_cyclic_db({'a': ['b'], 'b': ['c'], 'c': []}))
+
+    assert graph.patch(_cyclic_db({'a': ['b'], 'b': ['c'], 'c': []}, changed=[])) is graph
+    assert graph.patch(_cyclic_db({'a': ['b'], 'b': ['c'], 'c': []}, changed=['b'])) is graph
+
+    patched = graph.patch(_cyclic_db({'a': ['b', 'c'], 'b': [], 'c': []}, changed=['a', 'b']))
+    assert patched == DependentsGraph.build(_cyclic_db({'a': ['b', 'c'], 'b': [], 'c': []}))
+    assert patched.dependencies_of('a') == ('b', 'c')
+    assert patched.dependencies_of('b') == ()
+
+
+def test_patch_detects_cycles():
+    graph = DependentsGraph.build(_cyclic_db({'a': ['b'], 'b': ['c'], 'c': []}))
+
+    with pytest.raises(ValueError, match='a->b->c->a'):
+        graph.patch(_cyclic_db({'a': ['b'], 'b': ['c'], 'c': ['a']}, changed=['c']))
+
+
+def test_patch_rebuilds_on_new_packages():
+    graph = DependentsGraph.build(_cyclic_db({'a': ['b'], 'b': []}))
+    patched = graph.patch(_cyclic_db({'a': ['b'], 'b': ['c'], 'c': []}, changed=['c']))
+
+    assert patched.dependencies_of('b') == ('c',)
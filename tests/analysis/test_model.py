@@ -0,0 +1,17 @@
+from sebex.analysis.model import AnalysisEntry, Release
+from sebex.analysis.version import Version
+from sebex.config.manifest import ProjectHandle
+from tests.analysis.mock_database import stupid_db
+
+
+def test_analysis_entry_raw_roundtrip():
+    db = stupid_db()
+    for project in db.projects():
+        entry = db.about(project)
+        assert AnalysisEntry.from_raw(entry.to_raw()) == entry
+
+
+def test_analysis_entry_raw_roundtrip_with_releases():
+    entry = stupid_db().about(ProjectHandle.parse('b'))
+    entry.releases = [Release(Version(1, 0, 0)), Release(Version(0, 9, 0), retired=True)]
+    assert AnalysisEntry.from_raw(entry.to_raw()) == entry
@@ -0,0 +1,63 @@
+from sebex.analysis.graph import DependentsGraph
+from sebex.analysis.model import Release
+from sebex.analysis.snapshot import AnalysisSnapshot
+from sebex.analysis.version import Version
+from sebex.config.manifest import ProjectHandle
+from sebex.language.elixir import ElixirLanguageSupport
+from tests.analysis.mock_database import stupid_db
+
+
+def test_round_trip(context):
+    db = stupid_db({'a': '1.2.3'})
+    graph = DependentsGraph.build(db)
+
+    snapshot = AnalysisSnapshot.open()
+    assert snapshot.restore() is None
+
+    snapshot.store(db, graph, {p: str(p) for p in db.projects()})
+    snapshot.save()
+
+    restored_db, restored_graph = AnalysisSnapshot.open().restore()
+    assert list(restored_db.projects()) == list(db.projects())
+    assert set(restored_db.managed_packages()) == set(db.managed_packages())
+    assert restored_db.about(ProjectHandle.parse('a')) == db.about(ProjectHandle.parse('a'))
+    assert restored_db.about(ProjectHandle.parse('e:unused')).package == 'e'
+    assert restored_db.changed_projects() == frozenset()
+    assert restored_graph == graph
+    assert restored_graph.dependencies_of('c') == ('a', 'b')
+
+
+def test_freshness(context):
+    db = stupid_db()
+    fingerprints = {p: str(p) for p in db.projects()}
+
+    snapshot = AnalysisSnapshot.open()
+    assert not snapshot.is_fresh(fingerprints)
+
+    snapshot.store(db, DependentsGraph.build(db), fingerprints)
+    assert snapshot.is_fresh(fingerprints)
+
+    changed = {**fingerprints, ProjectHandle.parse('b'): 'other'}
+    assert not snapshot.is_fresh(changed)
+    assert snapshot.stale_projects(changed) == [ProjectHandle.parse('b')]
+
+    fewer = {p: f for p, f in fingerprints.items() if str(p) != 'g'}
+    assert not snapshot.is_fresh(fewer)
+
+
+def test_releases_are_refreshed(context, monkeypatch):
+    db = stupid_db()
+    db.about(ProjectHandle.parse('a')).releases = [Release(Version(1, 0, 0))]
+
+    snapshot = AnalysisSnapshot.open()
+    snapshot.store(db, DependentsGraph.build(db), {p: str(p) for p in db.projects()})
+    snapshot.save()
+
+    restored_db, _ = AnalysisSnapshot.open().restore()
+    assert not restored_db.about(ProjectHandle.parse('a')).is_published
+
+    monkeypatch.setattr(ElixirLanguageSupport, 'fetch_releases',
+                        lambda self, packages: {'a': [Release(Version(1, 1, 0))]})
+    restored_db.refresh_releases()
+    assert restored_db.about(ProjectHandle.parse('a')).releases == [Release(Version(1, 1, 0))]
+    assert not restored_db.about(ProjectHandle.parse('b')).is_published
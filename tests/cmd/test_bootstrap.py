@@ -0,0 +1,41 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from sebex.cmd.bootstrap import _import_organization
+from sebex.config.manifest import Manifest, ProjectManifest
+from tests.github_stub import StubGithub, serve_github
+
+
+def _repo(name: str, pushed_at: str = '2020-01-01T00:00:00Z'):
+    return {'name': name, 'full_name': f'org/{name}', 'ssh_url': f'git@github.com:org/{name}.git',
+            'default_branch': 'master', 'pushed_at': pushed_at, 'updated_at': pushed_at}
+
+
+@pytest.fixture
+def github_stub(context):
+    with serve_github() as url:
+        context.github_api_url = url
+        yield StubGithub
+
+
+def test_incremental_import(github_stub):
+    github_stub.repos = [_repo(f'r{i:03}') for i in range(150)]
+
+    manifest = Manifest.open()
+    _import_organization(manifest, 'org', full=False)
+    assert len(list(manifest.iter_repositories())) == 150
+    assert manifest.get_repository_by_name('r042').remote_url == 'git@github.com:org/r042.git'
+
+    # Customize a repository, which should survive re-bootstrap as long as it is unchanged
+    r001 = manifest.get_repository_by_name('r001')
+    manifest.upsert_repository(replace(r001, projects=[ProjectManifest(Path('sub'))]))
+    github_stub.repos[2] = {**_repo('r002', '2020-02-02T00:00:00Z'), 'default_branch': 'main'}
+
+    _import_organization(manifest, 'org', full=False)
+    assert [str(p.path) for p in manifest.get_repository_by_name('r001').projects] == ['sub']
+    assert manifest.get_repository_by_name('r002').default_branch == 'main'
+
+    _import_organization(manifest, 'org', full=True)
+    assert [str(p.path) for p in manifest.get_repository_by_name('r001').projects] == ['.']
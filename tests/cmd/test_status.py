@@ -0,0 +1,64 @@
+from git import Repo
+
+from sebex.cmd.status import status
+from sebex.config.manifest import Manifest, RepositoryManifest, ProjectManifest
+from sebex.vcs import RepositoryStatus
+
+
+def test_parse_detached_head_without_upstream():
+    st = RepositoryStatus.parse('# branch.oid 0123abcd\n'
+                                '# branch.head (detached)\n')
+
+    assert st == RepositoryStatus(branch=None)
+    assert not st.is_dirty
+
+
+def test_parse_changes():
+    st = RepositoryStatus.parse('# branch.oid 0123abcd\n'
+                                '# branch.head release-1.0\n'
+                                '# branch.upstream origin/release-1.0\n'
+                                '# branch.ab +0 -0\n'
+                                '1 M. N... 100644 100644 100644 0123 4567 mix.exs\n'
+                                '2 R. N... 100644 100644 100644 0123 0123 R100 new.ex\told.ex\n'
+                                'u UU N... 100644 100644 100644 100644 01 23 45 mix.lock\n'
+                                '? with space.txt\n'
+                                '! ignored.log\n')
+
+    assert st == RepositoryStatus(branch='release-1.0', upstream='origin/release-1.0',
+                                  changed=2, untracked=1, conflicts=1)
+    assert st.is_dirty
+
+
+def _clone(context, upstream, name: str) -> Repo:
+    manifest = Manifest.open()
+    manifest.upsert_repository(RepositoryManifest(name=name, remote_url=f'file://{upstream}',
+                                                  projects=[ProjectManifest()]))
+    manifest.save()
+
+    return Repo.clone_from(f'file://{upstream}', context.workspace_path / name)
+
+
+def test_status_table(context, upstream, capsys):
+    _clone(context, upstream, 'clean')
+    dirty = _clone(context, upstream, 'dirty')
+    (context.workspace_path / 'dirty' / 'file.txt').write_text('changed\n')
+    dirty.git.checkout('-b', 'feature')
+    behind = _clone(context, upstream, 'behind')
+    behind.git.reset('--hard', 'HEAD~2')
+
+    manifest = Manifest.open()
+    manifest.upsert_repository(RepositoryManifest(name='missing', remote_url='file:///nowhere',
+                                                  projects=[ProjectManifest()]))
+    manifest.save()
+
+    status.callback(dirty=False)
+    lines = {line.split()[0]: line for line in capsys.readouterr().out.splitlines()}
+
+    assert 'up to date' in lines['clean'] and 'clean' in lines['clean']
+    assert 'feature' in lines['dirty'] and '1 changed' in lines['dirty']
+    assert '-2' in lines['behind']
+    assert 'not cloned' in lines['missing']
+
+    status.callback(dirty=True)
+    listed = [line.split()[0] for line in capsys.readouterr().out.splitlines()[1:]]
+    assert sorted(listed) == ['behind', 'dirty', 'missing']
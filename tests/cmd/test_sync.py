@@ -0,0 +1,130 @@
+from pathlib import Path
+
+from git import Repo
+
+from sebex.cmd.sync import clone_repository, sync
+from sebex.config.clone import CloneSettings
+from sebex.config.manifest import RepositoryManifest, ProjectManifest, Manifest
+
+
+def _manifest(upstream: Path) -> RepositoryManifest:
+    return RepositoryManifest(name='repo', remote_url=f'file://{upstream}',
+                              projects=[ProjectManifest()])
+
+
+def test_settings_are_remembered(context):
+    settings = CloneSettings.open()
+    settings.depth = 1
+    settings.filter = 'blob:none'
+    settings.save()
+
+    assert CloneSettings.open().clone_options() == {'depth': 1, 'filter': 'blob:none'}
+
+    settings.depth = 0
+    settings.filter = 'none'
+    assert settings.clone_options() == {}
+
+
+def test_shallow_clone_fetches_tags(context, upstream):
+    settings = CloneSettings.open()
+    settings.depth = 1
+    settings.save()
+
+    manifest = _manifest(upstream)
+    clone_repository(manifest, settings)
+
+    vcs = manifest.handle.vcs
+    assert vcs.is_shallow
+    assert len(list(vcs.git.iter_commits('HEAD'))) == 1
+    assert sorted(t.name for t in vcs.git.tags) == [f'v{i}' for i in range(5)]
+
+    vcs.unshallow()
+    assert not vcs.is_shallow
+    assert len(list(vcs.git.iter_commits('HEAD'))) == 5
+
+
+def test_full_clone_by_default(context, upstream):
+    manifest = _manifest(upstream)
+    clone_repository(manifest, CloneSettings.open())
+
+    assert not manifest.handle.vcs.is_shallow
+    assert len(list(manifest.handle.vcs.git.iter_commits('HEAD'))) == 5
+
+
+def test_partial_clone(context, upstream):
+    settings = CloneSettings.open()
+    settings.filter = 'blob:none'
+
+    manifest = _manifest(upstream)
+    clone_repository(manifest, settings)
+
+    config = manifest.handle.vcs.git.config_reader()
+    assert config.get_value('remote "origin"', 'partialclonefilter') == 'blob:none'
+    assert (manifest.location / 'file.txt').read_text() == '4\n'
+
+
+def _push_commit(upstream: Path, message: str):
+    repo = Repo(upstream)
+    (upstream / 'file.txt').write_text(f'{message}\n')
+    repo.index.add(['file.txt'])
+    repo.index.commit(message)
+
+
+def test_repeated_fetches_are_skipped(context, upstream):
+    manifest = _manifest(upstream)
+    clone_repository(manifest, CloneSettings.open())
+    vcs = manifest.handle.vcs
+
+    vcs.fetch()
+    _push_commit(upstream, 'late')
+
+    vcs.pull()
+    assert (manifest.location / 'file.txt').read_text() == '4\n'
+
+    vcs.mark_stale()
+    vcs.pull()
+    assert (manifest.location / 'file.txt').read_text() == 'late\n'
+
+
+def test_fetch_all_remotes(context, upstream):
+    manifest = _manifest(upstream)
+    clone_repository(manifest, CloneSettings.open())
+    vcs = manifest.handle.vcs
+
+    _push_commit(upstream, 'late')
+    Repo(upstream).create_tag('v5')
+
+    vcs.fetch(all_remotes=True)
+    assert 'v5' in [t.name for t in vcs.git.tags]
+    assert vcs.git.commit('origin/master').message == 'late'
+
+
+def _sync_shallow_clone(context, upstream: Path) -> RepositoryManifest:
+    settings = CloneSettings.open()
+    settings.depth = 1
+
+    manifest = Manifest.open()
+    manifest.upsert_repository(_manifest(upstream))
+    manifest.save()
+
+    clone_repository(manifest.get_repository_by_name('repo'), settings)
+    return manifest.get_repository_by_name('repo')
+
+
+def test_sync_keeps_shallow_clones(context, upstream):
+    vcs = _sync_shallow_clone(context, upstream).handle.vcs
+
+    sync.callback(clone=True, fetch=True, depth=None, filter_spec=None, all_remotes=False)
+    assert vcs.is_shallow
+
+    sync.callback(clone=True, fetch=True, depth=0, filter_spec=None, all_remotes=False)
+    assert not vcs.is_shallow
+    assert CloneSettings.open().depth is None
+
+
+def test_ensure_full_history(context, upstream):
+    vcs = _sync_shallow_clone(context, upstream).handle.vcs
+
+    vcs.ensure_full_history()
+    assert not vcs.is_shallow
+    assert len(list(vcs.git.iter_commits('HEAD'))) == 5
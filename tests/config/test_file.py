@@ -0,0 +1,44 @@
+from typing import List
+
+import yaml
+
+from sebex.config import format as format_module
+from sebex.config.file import ConfigFile
+from sebex.config.format import Format, JsonFormat, YamlFormat
+
+
+class _State(ConfigFile):
+    _name = 'state'
+    _data = {'value': None}
+
+    @classmethod
+    def format(cls) -> Format:
+        return JsonFormat()
+
+    @classmethod
+    def legacy_formats(cls) -> List[Format]:
+        return [YamlFormat(autogenerated=True)]
+
+
+def test_reads_and_replaces_legacy_format(context):
+    legacy = context.meta_path / 'state.yaml'
+    legacy.write_text('value: 42\n')
+
+    assert _State.exists()
+    state = _State.open()
+    assert state._data == {'value': 42}
+
+    state._data['value'] = 43
+    state.save()
+    assert not legacy.exists()
+    assert (context.meta_path / 'state.json').exists()
+    assert _State.open()._data == {'value': 43}
+
+    state.delete()
+    assert not _State.exists()
+
+
+def test_uses_libyaml_when_available():
+    if yaml.__with_libyaml__:
+        assert format_module._YamlLoader is yaml.CSafeLoader
+        assert format_module._YamlDumper is yaml.CDumper
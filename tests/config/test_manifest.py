@@ -0,0 +1,38 @@
+import os
+
+from sebex.config.manifest import Manifest, RepositoryManifest, ProjectManifest, ProjectHandle
+
+
+def _repo(name: str) -> RepositoryManifest:
+    return RepositoryManifest(name=name, remote_url=f'git@github.com:org/{name}.git',
+                              projects=[ProjectManifest()])
+
+
+def test_current_manifest_is_shared_until_file_changes(context):
+    manifest = Manifest.open()
+    manifest.upsert_repository(_repo('a'))
+    manifest.save()
+
+    current = Manifest.current()
+    assert Manifest.current() is current
+    assert current.get_repository_by_name('a') is current.get_repository_by_name('a')
+
+    manifest.upsert_repository(_repo('b'))
+    manifest.save()
+    assert [r.name for r in Manifest.current().iter_repositories()] == ['a', 'b']
+
+    # Edited by hand
+    path = context.meta_path / 'manifest.yaml'
+    path.write_text(path.read_text().replace('name: b', 'name: c'))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert [r.name for r in Manifest.current().iter_repositories()] == ['a', 'c']
+
+
+def test_find_project(context):
+    manifest = Manifest.open()
+    manifest.upsert_repository(_repo('a'))
+
+    project = manifest.find_project(ProjectHandle.parse('a'))
+    assert project is next(manifest.get_repository_by_name('a').project_handles())
+    assert manifest.find_project(ProjectHandle.parse('b')) is None
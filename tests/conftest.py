@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from sebex.context import Context, METADATA_DIRECTORY_NAME
+
+
+@pytest.fixture
+def context(tmp_path: Path) -> Context:
+    """Activate a context operating in a fresh, empty workspace."""
+
+    (tmp_path / METADATA_DIRECTORY_NAME).mkdir()
+    ctx = Context(workspace=str(tmp_path), profile='all', github_access_token='token', jobs=4,
+                  assumeyes=True)
+
+    with Context.activate(ctx):
+        yield ctx
+
+
+@pytest.fixture
+def upstream(tmp_path_factory) -> Path:
+    """A local repository with a few tagged commits, to be cloned by tests."""
+
+    path = tmp_path_factory.mktemp('upstream')
+    repo = Repo.init(path, initial_branch='master')
+    repo.config_writer().set_value('uploadpack', 'allowFilter', 'true').release()
+
+    for i in range(5):
+        (path / 'file.txt').write_text(f'{i}\n')
+        repo.index.add(['file.txt'])
+        repo.index.commit(f'commit {i}')
+        repo.create_tag(f'v{i}')
+
+    return path
@@ -0,0 +1,134 @@
+import json
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Dict, List
+from urllib.parse import urlsplit, parse_qs
+
+
+class StubGithub(BaseHTTPRequestHandler):
+    requests: List[Dict] = []
+    version = 1
+    throttle_once = False
+    repos: List[Dict] = []
+    pulls: List[Dict] = []
+
+    def do_GET(self):
+        if self.path.startswith('/api/v3/orgs/'):
+            self._list_repos()
+            return
+
+        if '/pulls?' in self.path:
+            self._list_pulls()
+            return
+
+        self.requests.append({'path': self.path, 'etag': self.headers.get('If-None-Match'),
+                              'auth': self.headers.get('Authorization')})
+
+        if self.throttle_once:
+            StubGithub.throttle_once = False
+            self._respond(429, {'message': 'slow down'}, {'Retry-After': '0'})
+            return
+
+        etag = f'"v{self.version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._respond(304)
+        else:
+            self._respond(200, {'path': self.path, 'version': self.version}, {'ETag': etag})
+
+    def _list_repos(self):
+        url = urlsplit(self.path)
+        per_page = int(parse_qs(url.query)['per_page'][0])
+        page = int(parse_qs(url.query).get('page', ['1'])[0])
+        pages = max(1, -(-len(self.repos) // per_page))
+        self.requests.append({'path': self.path, 'etag': self.headers.get('If-None-Match')})
+
+        body = self.repos[(page - 1) * per_page:page * per_page]
+        etag = f'"{hash(json.dumps(body))}"'
+        last = f'http://{self.headers["Host"]}{url.path}?{url.query.split("&page=")[0]}&page={pages}'
+        headers = {'ETag': etag, 'Link': f'<{last}>; rel="last"'} if pages > 1 else {'ETag': etag}
+
+        if self.headers.get('If-None-Match') == etag:
+            self._respond(304, headers=headers)
+        else:
+            self._respond(200, body, headers)
+
+    def _list_pulls(self):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.requests.append({'path': self.path, 'etag': self.headers.get('If-None-Match')})
+
+        body = [p for p in reversed(self.pulls)
+                if p['url'].startswith(f'http://{self.headers["Host"]}{url.path}/')
+                and p['head']['label'] == query['head'] and p['base']['ref'] == query['base']
+                and query['state'] in ('all', p['state'])]
+        etag = f'"{hash(json.dumps(body))}"'
+
+        if self.headers.get('If-None-Match') == etag:
+            self._respond(304, headers={'ETag': etag})
+        else:
+            self._respond(200, body, {'ETag': etag})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.path.endswith('/pulls'):
+            self.requests.append({'method': 'POST', 'path': self.path, 'body': body})
+            self._create_pull(body)
+        elif body['variables'].get('fail'):
+            self._respond(200, {'errors': [{'message': 'boom'}]})
+        else:
+            self._respond(200, {'data': {'echo': body['variables']}})
+
+    def do_PUT(self):
+        self.requests.append({'method': 'PUT', 'path': self.path})
+        number = int(self.path.split('/')[-2])
+        pull = next(p for p in self.pulls if p['number'] == number)
+        pull.update(state='closed', merged=True)
+        self._respond(200, {'merged': True, 'message': 'Pull Request successfully merged'})
+
+    def _create_pull(self, body: Dict):
+        number = len(self.pulls) + 1
+        owner, repo = self.path.split('/')[4:6]
+        pull = {
+            'number': number,
+            'url': f'http://{self.headers["Host"]}{self.path}/{number}',
+            'html_url': f'https://github.com/{owner}/{repo}/pull/{number}',
+            'state': 'open',
+            'merged': False,
+            'title': body['title'],
+            'body': body['body'],
+            'head': {'label': f'{owner}:{body["head"]}', 'ref': body['head']},
+            'base': {'ref': body['base']},
+        }
+        self.pulls.append(pull)
+        self._respond(201, pull)
+
+    def _respond(self, status: int, body=None, headers: Dict[str, str] = None):
+        payload = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        for k, v in {'X-RateLimit-Remaining': '4000', 'X-RateLimit-Reset': '0',
+                     **(headers or {})}.items():
+            self.send_header(k, v)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def serve_github():
+    """Serve stub GitHub API, yields its root URL."""
+
+    StubGithub.requests = []
+    StubGithub.repos = []
+    StubGithub.pulls = []
+    StubGithub.version = 1
+    StubGithub.throttle_once = False
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubGithub)
+    Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}/api/v3'
+    finally:
+        server.shutdown()
@@ -0,0 +1,95 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Dict, List
+
+import pytest
+
+from sebex.analysis.model import Release, AnalysisError
+from sebex.analysis.version import Version
+from sebex.jobs import JobError
+from sebex.language.elixir.hex import fetch_hex_releases
+
+_PACKAGES = {
+    'ecto': {
+        'name': 'ecto',
+        'releases': [{'version': '3.3.3'}, {'version': '3.3.2'}, {'version': '3.3.1'}],
+        'retirements': {'3.3.2': {'reason': 'deprecated', 'message': None}},
+    },
+}
+
+
+class _StubHex(BaseHTTPRequestHandler):
+    requests: List[Dict] = []
+
+    def do_GET(self):
+        self.requests.append({'path': self.path, 'etag': self.headers.get('If-None-Match')})
+
+        name = self.path.rsplit('/', 1)[-1]
+        if name not in _PACKAGES:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        etag = f'"{name}-v1"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps(_PACKAGES[name]).encode()
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def hex_stub(context):
+    _StubHex.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHex)
+    Thread(target=server.serve_forever, daemon=True).start()
+    context.hex_api_url = f'http://127.0.0.1:{server.server_port}/api'
+    try:
+        yield _StubHex
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+_ECTO_RELEASES = [
+    Release(Version(3, 3, 3)),
+    Release(Version(3, 3, 2), retired=True),
+    Release(Version(3, 3, 1)),
+]
+
+
+def test_fetches_published_and_private_packages(hex_stub):
+    assert fetch_hex_releases(['ecto', 'private', 'ecto']) == {
+        'ecto': _ECTO_RELEASES,
+        'private': [],
+    }
+    assert sorted(r['path'] for r in hex_stub.requests) == ['/api/packages/ecto',
+                                                            '/api/packages/private']
+
+
+def test_revalidates_cached_responses(hex_stub):
+    fetch_hex_releases(['ecto'])
+    assert fetch_hex_releases(['ecto']) == {'ecto': _ECTO_RELEASES}
+    assert [r['etag'] for r in hex_stub.requests] == [None, '"ecto-v1"']
+
+
+def test_falls_back_to_cache_when_offline(hex_stub, context):
+    fetch_hex_releases(['ecto'])
+
+    context.hex_api_url = 'http://127.0.0.1:1/api'
+    assert fetch_hex_releases(['ecto']) == {'ecto': _ECTO_RELEASES}
+
+    with pytest.raises(JobError) as e:
+        fetch_hex_releases(['ecto', 'never_seen'])
+    assert isinstance(e.value.__cause__, AnalysisError)
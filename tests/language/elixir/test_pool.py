@@ -0,0 +1,84 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from sebex.analysis.model import AnalysisError
+from sebex.language.elixir.pool import AnalyzerPool
+
+_FAKE_ANALYZER = '''\
+#!{python}
+import json, os, sys, time
+
+print('noise from evaluated mix.exs', flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if 'die' in request['mix']:
+        sys.exit(1)
+    if 'hang' in request['mix']:
+        time.sleep(60)
+    # Output of evaluated mix.exs without trailing newline gets glued with the response
+    print('{{"id": "noise', end='')
+    print('\\x1esebex:' + json.dumps({{'id': request['id'], 'report': {{'mix': request['mix'], 'pid': os.getpid()}}}}), flush=True)
+'''
+
+
+@pytest.fixture
+def fake_analyzer(tmp_path) -> Path:
+    path = tmp_path / 'elixir_analyzer'
+    path.write_text(_FAKE_ANALYZER.format(python=sys.executable))
+    path.chmod(0o755)
+    return path
+
+
+def test_reuses_warm_workers(fake_analyzer):
+    pool = AnalyzerPool(fake_analyzer, size=1)
+    try:
+        first = pool.analyze(Path('a/mix.exs'))['report']
+        second = pool.analyze(Path('b/mix.exs'))['report']
+        assert first['mix'] == 'a/mix.exs'
+        assert second['mix'] == 'b/mix.exs'
+        assert first['pid'] == second['pid']
+    finally:
+        pool.close()
+
+
+def test_restarts_crashed_workers(fake_analyzer):
+    pool = AnalyzerPool(fake_analyzer, size=1)
+    try:
+        before = pool.analyze(Path('a/mix.exs'))['report']['pid']
+
+        with pytest.raises(AnalysisError, match='crashed'):
+            pool.analyze(Path('die/mix.exs'))
+
+        after = pool.analyze(Path('a/mix.exs'))['report']['pid']
+        assert before != after
+    finally:
+        pool.close()
+
+
+def test_bounded_concurrent_use(fake_analyzer):
+    pool = AnalyzerPool(fake_analyzer, size=2)
+    try:
+        paths = [Path(f'{i}/mix.exs') for i in range(10)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            reports = [r['report'] for r in executor.map(pool.analyze, paths)]
+        assert [r['mix'] for r in reports] == [str(p) for p in paths]
+        assert len({r['pid'] for r in reports}) <= 2
+    finally:
+        pool.close()
+
+
+def test_kills_stuck_workers(fake_analyzer):
+    pool = AnalyzerPool(fake_analyzer, size=1, timeout=0.5)
+    try:
+        before = pool.analyze(Path('a/mix.exs'))['report']['pid']
+
+        with pytest.raises(AnalysisError, match='timed out'):
+            pool.analyze(Path('hang/mix.exs'))
+
+        after = pool.analyze(Path('a/mix.exs'))['report']['pid']
+        assert before != after
+    finally:
+        pool.close()
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from threading import Lock
+from typing import List, Tuple, Optional, Type
+
+import pytest
+
+from sebex.analysis.model import Language
+from sebex.analysis.version import Version
+from sebex.config.manifest import ProjectHandle
+from sebex.edit.span import Span
+from sebex.jobs import JobError
+from sebex.release import executor
+from sebex.release.executor import Action, Task, proceed
+from sebex.release.state import ReleaseState, PhaseState, ProjectState, ReleaseStage
+
+_runs: List[Tuple[str, ReleaseStage]] = []
+_runs_lock = Lock()
+
+
+@dataclass
+class _FakeTask(Task):
+    """Records that it has been run, reaching stage of the real task it stands in for."""
+
+    @classmethod
+    def stage(cls) -> ReleaseStage:
+        return ReleaseStage.DONE
+
+    def run(self, release: ReleaseState) -> Action:
+        target = self.stage()
+        with _runs_lock:
+            _runs.append((str(self.project.project), target))
+
+        if str(self.project.project) == 'fail':
+            raise RuntimeError('boom')
+
+        if str(self.project.project) == 'b' and target == ReleaseStage.PULL_REQUEST_MERGED:
+            return Action.BREAKPOINT
+
+        return Action.PROCEED
+
+
+def _fake_task_type(real: Type[Task]) -> Type[Task]:
+    stage = real.stage()
+    return type(f'Fake{real.__name__}', (_FakeTask,), {'stage': classmethod(lambda cls: stage)})
+
+
+@pytest.fixture
+def fake_tasks(monkeypatch):
+    _runs.clear()
+    monkeypatch.setattr(executor, '_ALL_TASK_TYPES',
+                        [_fake_task_type(t) for t in executor._ALL_TASK_TYPES])
+
+
+def _project(name: str, depends_on: Optional[List[str]] = None) -> ProjectState:
+    return ProjectState(
+        project=ProjectHandle.parse(name),
+        from_version=Version(1, 0, 0),
+        to_version=Version(1, 1, 0),
+        version_span=Span.ZERO,
+        language=Language.ELIXIR,
+        depends_on=[ProjectHandle.parse(d) for d in depends_on] if depends_on is not None else None,
+    )
+
+
+def _release(*projects: str) -> ReleaseState:
+    return ReleaseState(sources={}, phases=[PhaseState([_project(p) for p in projects])])
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_proceed(context, fake_tasks, parallel):
+    rel = _release('a', 'b', 'c:sub', 'c')
+
+    assert proceed(rel, parallel=parallel) == Action.BREAKPOINT
+
+    stages = {str(p.project): p.stage for p in rel.current_phase()}
+    assert stages == {
+        'a': ReleaseStage.DONE,
+        'b': ReleaseStage.PULL_REQUEST_OPENED,
+        'c:sub': ReleaseStage.DONE,
+        'c': ReleaseStage.DONE,
+    }
+
+    # Projects sharing a repository are processed one after another
+    c_runs = [p for p, _ in _runs if p.startswith('c')]
+    assert c_runs == sorted(c_runs, key=lambda p: p != 'c:sub')
+
+    if parallel:
+        saved = ReleaseState.open()
+        assert {str(p.project): p.stage for p in saved.current_phase()} == stages
+
+
+def test_proceed_parallel_lets_other_projects_finish(context, fake_tasks):
+    others = [f'p{i}' for i in range(context.git_jobs * 2)]
+    rel = _release('fail', *others)
+
+    with pytest.raises(JobError):
+        proceed(rel, parallel=True)
+
+    saved = ReleaseState.open()
+    for rel in (rel, saved):
+        stages = {str(p.project): p.stage for p in rel.current_phase()}
+        assert stages == {'fail': ReleaseStage.CLEAN, **{p: ReleaseStage.DONE for p in others}}
+
+
+def test_proceed_pipeline(context, fake_tasks):
+    rel = ReleaseState(sources={}, phases=[
+        PhaseState([_project('a', []), _project('b', [])]),
+        PhaseState([_project('c', ['a']), _project('d', ['a', 'b'])]),
+        PhaseState([_project('e', ['c'])]),
+    ])
+
+    assert proceed(rel, pipeline=True) == Action.BREAKPOINT
+
+    assert {str(p.project): p.stage for phase in rel.phases for p in phase} == {
+        'a': ReleaseStage.DONE,
+        'b': ReleaseStage.PULL_REQUEST_OPENED,
+        'c': ReleaseStage.DONE,
+        'd': ReleaseStage.CLEAN,
+        'e': ReleaseStage.DONE,
+    }
+
+    # Each project starts only after its dependencies got published
+    started = [p for p, s in _runs if s == ReleaseStage.BRANCH_OPENED]
+    published = [p for p, s in _runs if s == ReleaseStage.PUBLISHED]
+    assert started.index('c') > published.index('a')
+    assert started.index('e') > published.index('c')
+
+
+def test_proceed_pipeline_without_dependencies(context, fake_tasks):
+    rel = ReleaseState(sources={}, phases=[
+        PhaseState([_project('a'), _project('b')]),
+        PhaseState([_project('c')]),
+    ])
+
+    assert proceed(rel, pipeline=True) == Action.BREAKPOINT
+
+    # Plans made before dependencies were tracked wait for whole phases
+    assert rel.get_project(ProjectHandle.parse('c')).stage == ReleaseStage.CLEAN
+    assert rel.get_project(ProjectHandle.parse('a')).stage == ReleaseStage.DONE
@@ -59,6 +59,7 @@ def test_source_already_released():
                             to_spec_span=Span.ZERO,
                         ),
                     ],
+                    depends_on=[],
                 )
             ]),
         ],
@@ -84,6 +85,7 @@ def test_release_stable_patch_without_deps():
                     to_version=Version.parse('1.0.1'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ])
         ],
@@ -109,6 +111,7 @@ def test_release_stable_minor_without_deps():
                     to_version=Version.parse('1.1.0'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ])
         ],
@@ -134,6 +137,7 @@ def test_release_stable_major_without_deps():
                     to_version=Version.parse('2.0.0'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ])
         ],
@@ -159,6 +163,7 @@ def test_release_stable_patch_with_one_level_of_deps():
                     to_version=Version.parse('1.0.1'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ]),
         ],
@@ -184,6 +189,7 @@ def test_release_stable_minor_with_one_level_of_deps_with_targeting_spec():
                     to_version=Version.parse('1.1.0'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ]),
         ],
@@ -212,6 +218,7 @@ def test_release_stable_minor_with_one_level_of_deps_with_higher_spec():
                     to_version=Version.parse('1.3.0'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ]),
         ],
@@ -237,6 +244,7 @@ def test_release_stable_major_with_one_level_of_deps():
                     to_version=Version.parse('2.0.0'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ]),
             PhaseState([
@@ -254,6 +262,7 @@ def test_release_stable_major_with_one_level_of_deps():
                             to_spec_span=Span.ZERO,
                         ),
                     ],
+                    depends_on=[ProjectHandle.parse('a0')],
                 )
             ]),
         ],
@@ -279,6 +288,7 @@ def test_release_indirect_bump_with_one_level_of_deps():
                     to_version=Version.parse('1.2.3'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ]),
         ],
@@ -304,6 +314,7 @@ def test_release_pre_patch():
                     to_version=Version.parse('0.1.1'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ]),
         ],
@@ -329,6 +340,7 @@ def test_release_pre_minor():
                     to_version=Version.parse('0.2.0'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 )
             ]),
             PhaseState([
@@ -346,6 +358,7 @@ def test_release_pre_minor():
                             to_spec_span=Span.ZERO,
                         )
                     ],
+                    depends_on=[ProjectHandle.parse('a0')],
                 ),
                 ProjectState(
                     project=ProjectHandle.parse('b1'),
@@ -361,6 +374,7 @@ def test_release_pre_minor():
                             to_spec_span=Span.ZERO,
                         )
                     ],
+                    depends_on=[ProjectHandle.parse('a0')],
                 ),
             ]),
         ],
@@ -386,6 +400,7 @@ def test_triangle():
                     to_version=Version.parse('2.0.0'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 ),
             ]),
             PhaseState([
@@ -403,6 +418,7 @@ def test_triangle():
                             to_spec_span=Span.ZERO,
                         ),
                     ],
+                    depends_on=[ProjectHandle.parse('c')],
                 ),
             ]),
             PhaseState([
@@ -420,6 +436,7 @@ def test_triangle():
                             to_spec_span=Span.ZERO,
                         ),
                     ],
+                    depends_on=[ProjectHandle.parse('b'), ProjectHandle.parse('c')],
                 ),
             ]),
         ],
@@ -445,6 +462,7 @@ def test_chain_major():
                     to_version=Version.parse('2.0.0'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 ),
             ]),
             PhaseState([
@@ -462,6 +480,7 @@ def test_chain_major():
                             to_spec_span=Span.ZERO,
                         ),
                     ],
+                    depends_on=[ProjectHandle.parse('a0')],
                 ),
             ]),
         ],
@@ -635,6 +654,7 @@ def test_does_not_release_obsolete_relation():
                     to_version=Version.parse('1.0.1'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 ),
             ]),
         ],
@@ -664,6 +684,7 @@ def test_does_not_release_obsolete_relation_transitive():
                     to_version=Version.parse('1.0.1'),
                     version_span=Span.ZERO,
                     language=Language.ELIXIR,
+                    depends_on=[],
                 ),
             ]),
         ],
@@ -711,6 +732,7 @@ def test_serialization():
                             to_spec_span=Span.ZERO,
                         ),
                     ],
+                    depends_on=[ProjectHandle.parse('c')],
                 ),
             ]),
         ],
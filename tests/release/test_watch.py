@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from sebex.analysis.model import Language
+from sebex.analysis.version import Version
+from sebex.config.manifest import ProjectHandle
+from sebex.edit.span import Span
+from sebex.release import watch
+from sebex.release.state import ProjectState
+from sebex.release.watch import MergeStatus, Readiness, PullRequestWatcher
+from sebex.vcs import PullRequestState
+
+_OPEN = {'number': 1, 'html_url': 'url', 'state': 'open', 'merged': False, 'mergeable': True}
+_GREEN = {'state': 'success', 'statuses': [{'context': 'ci', 'state': 'success'}]}
+
+
+def _evaluate(pr=None, status=None, reviews=None) -> MergeStatus:
+    return MergeStatus.evaluate(PullRequestState.from_rest({**_OPEN, **(pr or {})},
+                                                           status or _GREEN, reviews or []))
+
+
+def _readiness(pr=None, status=None, reviews=None) -> Readiness:
+    return _evaluate(pr, status, reviews).readiness
+
+
+def test_evaluate():
+    assert _readiness() == Readiness.READY
+    assert _readiness(pr={'merged': True, 'state': 'closed'}) == Readiness.MERGED
+    assert _readiness(pr={'state': 'closed'}) == Readiness.CLOSED
+    assert _readiness(pr={'mergeable': None}) == Readiness.WAITING
+    assert _readiness(pr={'mergeable': False}) == Readiness.BLOCKED
+
+
+def test_evaluate_statuses():
+    pending = {'state': 'pending', 'statuses': [{'context': 'ci', 'state': 'pending'}]}
+    failed = {'state': 'failure', 'statuses': [{'context': 'ci', 'state': 'failure'}]}
+
+    assert _readiness(status=pending) == Readiness.WAITING
+    assert _readiness(status={'state': 'pending', 'statuses': []}) == Readiness.READY
+    assert _evaluate(status=failed) == MergeStatus(Readiness.BLOCKED, 'failed statuses: ci')
+
+
+def test_evaluate_reviews():
+    def review(login, state):
+        return {'user': {'login': login}, 'state': state}
+
+    assert _readiness(reviews=[review('alice', 'CHANGES_REQUESTED')]) == Readiness.BLOCKED
+    assert _readiness(reviews=[review('alice', 'CHANGES_REQUESTED'),
+                               review('alice', 'APPROVED')]) == Readiness.READY
+
+
+_READY = MergeStatus(Readiness.READY)
+_WAITING = MergeStatus(Readiness.WAITING)
+
+
+@pytest.fixture
+def scripted_polls(monkeypatch) -> List:
+    """Polls return (or raise) given results one by one, sleeping is skipped."""
+
+    script = []
+
+    def poll(self, project):
+        result = script.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(PullRequestWatcher, '_poll', poll)
+    monkeypatch.setattr(watch, 'time', SimpleNamespace(sleep=lambda _: None))
+    return script
+
+
+def _projects() -> List[ProjectState]:
+    return [ProjectState(project=ProjectHandle.parse('a'), from_version=Version(1, 0, 0),
+                         to_version=Version(1, 1, 0), version_span=Span.ZERO,
+                         language=Language.ELIXIR)]
+
+
+def test_wait_retries_failed_polls(context, scripted_polls):
+    scripted_polls.extend([(None, _WAITING, True), ConnectionError('boom'),
+                           (_WAITING, _READY, True)])
+    assert PullRequestWatcher().wait(_projects())
+    assert not scripted_polls
+
+
+def test_wait_gives_up_on_declined_pull_requests(context, scripted_polls):
+    scripted_polls.extend([(_READY, _READY, False)])
+    assert not PullRequestWatcher().wait(_projects())
+
+    # Failed poll tells nothing about whether the pull request can change
+    scripted_polls.extend([ConnectionError('boom'), (_READY, _READY, False)])
+    assert not PullRequestWatcher().wait(_projects())
+    assert not scripted_polls
@@ -0,0 +1,48 @@
+import os
+
+from sebex import context as context_module
+from sebex.context import Context, default_jobs, default_analyze_jobs, ANALYZER_WORKER_MEMORY
+
+
+def test_default_jobs_is_capped(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+    assert default_jobs() == 8
+
+    monkeypatch.setattr(os, 'cpu_count', lambda: 128)
+    assert default_jobs() == 32
+
+
+def test_analyze_jobs_are_limited_by_cores_and_memory(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 16)
+
+    monkeypatch.setattr(context_module, '_available_memory', lambda: None)
+    assert default_analyze_jobs(32) == 16
+    assert default_analyze_jobs(4) == 4
+
+    monkeypatch.setattr(context_module, '_available_memory', lambda: 3 * ANALYZER_WORKER_MEMORY)
+    assert default_analyze_jobs(32) == 3
+
+    monkeypatch.setattr(context_module, '_available_memory', lambda: 0)
+    assert default_analyze_jobs(32) == 1
+
+
+def test_available_memory_includes_reclaimable_cache(monkeypatch, tmp_path):
+    meminfo = tmp_path / 'meminfo'
+    meminfo.write_text('MemTotal:       16384000 kB\n'
+                       'MemFree:          512000 kB\n'
+                       'MemAvailable:    8192000 kB\n')
+    monkeypatch.setattr(context_module, '_MEMINFO_PATH', str(meminfo))
+    assert context_module._available_memory() == 8192000 * 1024
+
+    monkeypatch.setattr(context_module, '_MEMINFO_PATH', str(tmp_path / 'missing'))
+    assert context_module._available_memory() == \
+        os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+
+
+def test_specific_limits_default_to_jobs(tmp_path):
+    ctx = Context(workspace=str(tmp_path), profile='all', github_access_token='token', jobs=6,
+                  assumeyes=True, net_jobs=64)
+
+    assert ctx.git_jobs == 6
+    assert ctx.net_jobs == 64
+    assert 1 <= ctx.analyze_jobs <= 6
@@ -0,0 +1,84 @@
+import pytest
+from github import GithubException
+
+from sebex.github_api import GithubClient, RateLimiter
+from tests.github_stub import StubGithub as _StubGithub, serve_github
+
+
+@pytest.fixture
+def github_stub(context):
+    with serve_github() as url:
+        yield url
+
+
+def test_get_revalidates_cached_responses(github_stub):
+    client = GithubClient('token', api_url=github_stub)
+
+    assert client.get('repos/org/a') == ({'path': '/api/v3/repos/org/a', 'version': 1}, True)
+    assert client.get('repos/org/a') == ({'path': '/api/v3/repos/org/a', 'version': 1}, False)
+    client.save()
+
+    # Cache is persisted in the workspace and shared by subsequent runs
+    client = GithubClient('token', api_url=github_stub)
+    _StubGithub.version = 2
+    assert client.get(f'{github_stub}/repos/org/a') == \
+        ({'path': '/api/v3/repos/org/a', 'version': 2}, True)
+
+    assert [r['etag'] for r in _StubGithub.requests] == [None, '"v1"', '"v1"']
+    assert all(r['auth'] == 'token token' for r in _StubGithub.requests)
+
+
+def test_get_retries_when_throttled(github_stub):
+    _StubGithub.throttle_once = True
+    client = GithubClient('token', api_url=github_stub)
+
+    assert client.get('repos/org/a')[0]['version'] == 1
+    assert len(_StubGithub.requests) == 2
+
+
+def test_graphql(github_stub):
+    client = GithubClient('token', api_url=github_stub)
+    assert client.graphql_url.endswith('/api/graphql')
+
+    assert client.graphql('query { x }', {'a': 1}) == {'echo': {'a': 1}}
+    with pytest.raises(GithubException):
+        client.graphql('query { x }', {'fail': True})
+
+
+def test_rate_limiter_pacing():
+    now = [1000.0]
+    sleeps = []
+    limiter = RateLimiter(pace_below=100, reserve=10, clock=lambda: now[0], sleep=sleeps.append)
+
+    limiter.acquire()
+    limiter.update({'X-RateLimit-Remaining': '4000', 'X-RateLimit-Reset': '2000'})
+    limiter.acquire()
+    assert sleeps == []
+
+    # 60 requests left above reserve, spread evenly over 1000 seconds until reset
+    limiter.update({'X-RateLimit-Remaining': '60', 'X-RateLimit-Reset': '2000'})
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+    assert sleeps == [pytest.approx(20), pytest.approx(20 + 1000 / 49)]
+
+    # Only reserve is left, wait for reset
+    sleeps.clear()
+    limiter.update({'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': '2000'})
+    limiter.acquire()
+    assert sleeps == [pytest.approx(1000)]
+
+
+def test_get_all_fetches_pages(github_stub):
+    _StubGithub.repos = [{'name': f'r{i}'} for i in range(25)]
+    client = GithubClient('token', api_url=github_stub)
+
+    items, changed = client.get_all('orgs/org/repos?per_page=10')
+    assert [r['name'] for r in items] == [f'r{i}' for i in range(25)]
+    assert changed
+    assert len(_StubGithub.requests) == 3
+
+    items, changed = client.get_all('orgs/org/repos?per_page=10')
+    assert len(items) == 25
+    assert not changed
+    assert all(r['etag'] is not None for r in _StubGithub.requests[3:])
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from threading import Lock, Barrier
+
+import pytest
+
+from sebex.context import Context
+from sebex.jobs import for_each, run_jobs, JobError, JobKind, cancellation
+
+
+def test_returns_results_in_order_of_items(context):
+    def slow_first(i: int) -> int:
+        time.sleep(0.2 if i == 0 else 0)
+        return i * 10
+
+    assert for_each(range(5), slow_first, desc='Job') == [0, 10, 20, 30, 40]
+
+
+def test_streams_results_in_order_of_completion(context):
+    def slow_first(i: int) -> int:
+        time.sleep(0.3 if i == 0 else 0)
+        return i
+
+    async def collect():
+        return [r.value async for r in run_jobs(range(3), slow_first, desc='Job', jobs=3)]
+
+    assert asyncio.run(collect())[-1] == 0
+
+
+def test_jobs_see_current_context(context):
+    assert for_each(range(3), lambda _: Context.current(), desc='Job') == [context] * 3
+
+
+def test_first_failure_drops_jobs_not_started(context):
+    started = []
+
+    def job(i: int):
+        started.append(i)
+        if i == 0:
+            raise ValueError('boom')
+        time.sleep(0.1)
+
+    with pytest.raises(JobError) as e:
+        for_each(range(10), job, desc='Job', jobs=1)
+
+    assert isinstance(e.value.__cause__, ValueError)
+    assert len(started) < 10
+
+
+def test_keep_going_reports_all_failures(context, capsys):
+    def job(i: int) -> int:
+        if i % 2:
+            raise ValueError(f'odd {i}')
+        return i
+
+    with pytest.raises(JobError) as e:
+        for_each(range(4), job, desc='Job', keep_going=True)
+
+    assert [f.desc for f in e.value.failures] == ['Job: 1', 'Job: 3']
+    assert 'odd 3' in capsys.readouterr().out
+
+
+def test_kind_limit_is_shared_by_concurrent_calls(context):
+    context.net_jobs = 2
+    lock = Lock()
+    running = peak = 0
+
+    def job(_):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    def outer(_):
+        for_each(range(4), job, desc='Inner', kind=JobKind.NETWORK)
+
+    for_each(range(3), outer, desc='Outer', kind=JobKind.GIT)
+    assert peak == 2
+
+
+def test_default_kind_is_limited_by_jobs(context):
+    context.jobs = 3
+    context.analyze_jobs = 1
+    barrier = Barrier(3, timeout=5)
+
+    # All three jobs have to run at once to pass the barrier
+    assert for_each(range(3), lambda i: barrier.wait() is not None, desc='Job') == [True] * 3
+
+
+def test_nested_jobs_of_same_kind_do_not_deadlock(context):
+    context.jobs = 1
+
+    def outer(i: int) -> int:
+        return sum(for_each(range(3), lambda j: i + j, desc='Inner'))
+
+    assert for_each(range(2), outer, desc='Outer') == [3, 6]
+
+
+def test_stopping_consumption_cancels_running_jobs(context):
+    cancelled = []
+
+    def job(i: int):
+        if i == 0:
+            return i
+        while not cancellation().is_set():
+            time.sleep(0.01)
+        cancelled.append(i)
+
+    async def first():
+        async for result in run_jobs(range(3), job, desc='Job', jobs=3):
+            return result.value
+
+    assert asyncio.run(first()) == 0
+    assert sorted(cancelled) == [1, 2]
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sebex.log import buffered, log, logcontext
+
+
+def test_buffered_holds_lines_until_exit(capsys):
+    with buffered() as lines:
+        log('first')
+        log('second')
+        assert capsys.readouterr().out == ''
+        assert len(lines) == 2
+
+    assert capsys.readouterr().out == 'first\nsecond\n'
+
+
+def test_nested_buffers_flow_into_outer(capsys):
+    with buffered():
+        with buffered():
+            log('inner')
+        assert capsys.readouterr().out == ''
+        log('outer')
+
+    assert capsys.readouterr().out == 'inner\nouter\n'
+
+
+def test_buffered_output_of_threads_does_not_interleave(capsys):
+    def job(name: str):
+        with buffered(), logcontext(name):
+            for i in range(50):
+                log(i)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(job, ['a', 'b', 'c', 'd']))
+
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 200
+    for block in range(4):
+        chunk = out[block * 50:(block + 1) * 50]
+        assert len({line.split(']')[0] for line in chunk}) == 1
@@ -0,0 +1,89 @@
+import subprocess
+import sys
+import time
+from threading import Event, Timer
+
+import pytest
+
+from sebex import popen as popen_module
+from sebex.popen import popen, ProcessCancelled
+
+
+def python(code: str):
+    return [sys.executable, '-c', code]
+
+
+def test_streams_lines_as_they_arrive(capsys):
+    proc = popen(python('import sys, time\n'
+                        'print("first", flush=True)\n'
+                        'time.sleep(0.3)\n'
+                        'print("second")\n'
+                        'sys.stdout.write("no newline")'), log_stdout=True)
+
+    assert proc.returncode == 0
+    assert proc.stdout == 'first\nsecond\nno newline'
+    out = capsys.readouterr().out.splitlines()
+    assert [line.split('] ')[-1] for line in out] == ['first', 'second', 'no newline']
+
+
+def test_keeps_only_tail_of_output(monkeypatch, capsys):
+    monkeypatch.setattr(popen_module, 'TAIL_LINES', 10)
+
+    proc = popen(python('for i in range(10000): print(i)'), log_stdout=True)
+
+    assert proc.stdout.splitlines() == [str(i) for i in range(9990, 10000)]
+    assert len(capsys.readouterr().out.splitlines()) == 10000
+
+
+def test_reports_stderr_on_failure(capsys):
+    with pytest.raises(subprocess.CalledProcessError) as info:
+        popen(python('import sys\n'
+                     'print("working")\n'
+                     'print("broken", file=sys.stderr)\n'
+                     'sys.exit(3)'), log_stdout=True)
+
+    assert info.value.returncode == 3
+    assert info.value.stderr == 'broken'
+    out = capsys.readouterr().out
+    assert out.count('working') == 1
+    assert out.count('broken') == 1
+
+
+def test_streams_stderr_as_it_arrives(capsys):
+    popen(python('import sys, time\n'
+                 'print("progress", file=sys.stderr, flush=True)\n'
+                 'time.sleep(0.2)\n'
+                 'print("done")'), log_stdout=True)
+
+    out = [line.split('] ')[-1] for line in capsys.readouterr().out.splitlines()]
+    assert out == ['progress', 'done']
+
+
+def test_unchecked_failure_returns_result():
+    proc = popen(python('import sys; sys.exit(1)'), log_stdout=True, check=False)
+    assert proc.returncode == 1
+
+
+def test_timeout_terminates_process():
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        popen(python('import time; print("started", flush=True); time.sleep(30)'),
+              log_stdout=True, timeout=0.5)
+    assert time.monotonic() - start < 10
+
+
+def test_cancel_terminates_process():
+    cancel = Event()
+    Timer(0.3, cancel.set).start()
+
+    start = time.monotonic()
+    with pytest.raises(ProcessCancelled) as info:
+        popen(python('import time; time.sleep(30)'), cancel=cancel)
+    assert 'has been cancelled' in str(info.value)
+    assert time.monotonic() - start < 10
+
+
+def test_captures_whole_output_without_logging(capsys):
+    proc = popen(python('for i in range(3): print(i)'))
+    assert proc.stdout == '0\n1\n2\n'
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,116 @@
+from git import Repo
+
+from sebex.config.manifest import RepositoryHandle, Manifest, RepositoryManifest, ProjectManifest
+from sebex.vcs import PullRequestState, PullRequest
+from tests.github_stub import StubGithub, serve_github
+
+
+def test_pull_request_state_from_graphql():
+    node = {
+        'number': 12,
+        'url': 'https://github.com/org/repo/pull/12',
+        'state': 'OPEN',
+        'merged': False,
+        'mergeable': 'MERGEABLE',
+        'headRepositoryOwner': {'login': 'org'},
+        'commits': {'nodes': [{'commit': {'status': {
+            'state': 'PENDING',
+            'contexts': [{'context': 'ci/build', 'state': 'SUCCESS'},
+                         {'context': 'ci/test', 'state': 'PENDING'}],
+        }}}]},
+        'reviews': {'nodes': [{'author': {'login': 'alice'}, 'state': 'APPROVED'},
+                              {'author': None, 'state': 'COMMENTED'}]},
+    }
+
+    assert PullRequestState.from_graphql(node) == PullRequestState(
+        number=12,
+        url='https://github.com/org/repo/pull/12',
+        state='open',
+        merged=False,
+        mergeable=True,
+        status='pending',
+        statuses=(('ci/build', 'success'), ('ci/test', 'pending')),
+        reviews=(('alice', 'APPROVED'),),
+    )
+
+
+def test_pull_request_state_from_graphql_without_status():
+    node = {
+        'number': 3,
+        'url': 'url',
+        'state': 'MERGED',
+        'merged': True,
+        'mergeable': 'UNKNOWN',
+        'commits': {'nodes': [{'commit': {'status': None}}]},
+        'reviews': {'nodes': []},
+    }
+
+    state = PullRequestState.from_graphql(node)
+    assert state.state == 'closed'
+    assert state.merged
+    assert state.mergeable is None
+    assert state.status is None
+    assert state.statuses == ()
+
+
+def test_index_queries(context, upstream):
+    repo = RepositoryHandle('repo')
+    Repo.clone_from(f'file://{upstream}', repo.location)
+    vcs = repo.vcs
+    file = repo.location / 'file.txt'
+    new_file = repo.location / 'sub dir' / 'new.txt'
+
+    assert vcs.is_tracked(file)
+    assert not vcs.is_tracked(new_file)
+    assert not vcs.is_tracked(upstream / 'file.txt')
+    assert not vcs.is_changed(file)
+
+    file.write_text('changed\n')
+    assert vcs.is_changed(file)
+
+    new_file.parent.mkdir()
+    new_file.write_text('new\n')
+    vcs.checkout('feature', ensure_clean=False)
+    assert vcs.branch_exists('feature')
+
+    with vcs.git.config_writer() as config:
+        config.set_value('user', 'name', 'Test')
+        config.set_value('user', 'email', 'test@example.com')
+    vcs.commit('add file')
+    assert vcs.is_tracked(new_file)
+    assert not vcs.is_changed(file)
+
+    vcs.checkout('master')
+    assert not vcs.is_tracked(new_file)
+
+
+def test_pull_requests(context):
+    manifest = Manifest.open()
+    manifest.upsert_repository(RepositoryManifest(name='repo',
+                                                  remote_url='git@github.com:org/repo.git',
+                                                  projects=[ProjectManifest()]))
+    manifest.save()
+    vcs = RepositoryHandle('repo').vcs
+
+    with serve_github() as url:
+        context.github_api_url = url
+
+        assert vcs.find_pull_request('feature') is None
+        assert vcs.open_pull_request('Title', 'Body', branch='feature', push=False)
+        assert not vcs.open_pull_request('Title', 'Body', branch='feature', push=False)
+
+        pr = vcs.find_pull_request('feature')
+        assert pr == PullRequest(number=1, url=f'{url}/repos/org/repo/pulls/1',
+                                 html_url='https://github.com/org/repo/pull/1')
+        assert StubGithub.pulls[0]['base']['ref'] == 'master'
+        assert StubGithub.pulls[0]['body'].startswith('Body')
+
+        assert vcs.merge_pull_request(pr.number) == (True, 'Pull Request successfully merged')
+        assert vcs.find_pull_request('feature') is None
+        assert vcs.find_pull_request('feature', state='all') == pr
+
+    # Pull request listings are revalidated through the ETag cache
+    open_listings = [r for r in StubGithub.requests if '/pulls?' in r['path']
+                     and 'state=open' in r['path']]
+    assert open_listings[0]['etag'] is None
+    assert all(r['etag'] is not None for r in open_listings[1:])